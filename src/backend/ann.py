@@ -0,0 +1,180 @@
+"""
+Approximate nearest-neighbour retrieval for large internship catalogs
+
+Before the 1.0 cap, the six-factor match score is an inner product between
+an internship vector (skill indicators / skill count, one-hot categorical
+values) and a user vector (skill indicators, per-value factor tables), so
+candidate retrieval is a maximum inner product search. LSHIndex hashes the
+internship vectors with signed random projections after subtracting the
+catalog mean vector; that shifts every inner product for a user by the same
+constant, so the ranking is unchanged while the angles become far more
+discriminative. A query probes its own bucket in each table plus the
+buckets reached by flipping its least certain bits, and the candidates are
+re-ranked exactly by ScoringEngine.
+"""
+
+import time
+
+import numpy as np
+
+from recommender import SKILLS_WEIGHT, top_n_indices
+
+# Scale of the one-hot categorical coordinates relative to the skill block.
+# Inner products are unchanged (the query tables are divided by the same
+# factor); a smaller value lets the skill block dominate the hash angle.
+FIELD_SCALE = 0.1
+
+# Rows hashed per block while building, bounds the dense projection buffer
+BUILD_CHUNK = 65536
+
+
+def default_bits(size):
+    """Bits per table so that buckets stay around a few dozen internships."""
+    return int(np.clip(int(np.log2(max(size, 1))) - 4, 8, 20))
+
+
+class LSHIndex:
+    def __init__(self, engine, tables=32, bits=None, probes=2, seed=0):
+        start = time.perf_counter()
+        self.tables = tables
+        self.bits = bits or default_bits(engine.size)
+        if self.bits > 62:
+            raise ValueError("bits must be at most 62")
+        self.probes = probes
+        self._rng = np.random.default_rng(seed)
+        self._width = tables * self.bits
+        self._skill_proj = np.empty((0, self._width))
+        self._field_proj = {field: np.empty((0, self._width)) for field in engine.codes}
+        self._weights = 1 << np.arange(self.bits, dtype=np.int64)
+        self._center = None
+
+        self.size = engine.size
+        keys = self._hash_rows(engine, 0)
+        self._order = []
+        self._sorted_keys = []
+        for t in range(tables):
+            order = np.argsort(keys[:, t], kind="stable")
+            self._order.append(order)
+            self._sorted_keys.append(keys[order, t])
+        self.build_seconds = time.perf_counter() - start
+
+    def _grow_projections(self, engine):
+        # New skills / categorical values get fresh random rows; existing
+        # internships have a zero coordinate there, so their hashes are stable
+        extra = len(engine.skill_ids) - len(self._skill_proj)
+        if extra > 0:
+            self._skill_proj = np.vstack([self._skill_proj, self._rng.standard_normal((extra, self._width))])
+        for field, values in engine.values.items():
+            extra = len(values) - len(self._field_proj[field])
+            if extra > 0:
+                self._field_proj[field] = np.vstack(
+                    [self._field_proj[field], self._rng.standard_normal((extra, self._width))]
+                )
+
+    def _project(self, engine, start, stop):
+        counts = engine.skill_counts[start:stop]
+        skill_weights = np.divide(SKILLS_WEIGHT, counts, out=np.zeros(len(counts)), where=counts > 0)
+        block = engine.skill_matrix[start:stop].multiply(skill_weights[:, None]).tocsr()
+        proj = block @ self._skill_proj
+        for field, codes in engine.codes.items():
+            proj += FIELD_SCALE * self._field_proj[field][codes[start:stop]]
+        return proj
+
+    def _hash_rows(self, engine, first_row):
+        """Bucket keys, shape (rows, tables), of engine rows from `first_row` on."""
+        self._grow_projections(engine)
+        if self._center is None:
+            # Projection of the catalog mean vector; fixed once built so that
+            # rows appended later are hashed consistently
+            self._center = np.zeros(self._width)
+            for start in range(0, engine.size, BUILD_CHUNK):
+                stop = min(start + BUILD_CHUNK, engine.size)
+                self._center += self._project(engine, start, stop).sum(axis=0)
+            self._center /= max(engine.size, 1)
+
+        keys = np.empty((engine.size - first_row, self.tables), dtype=np.int64)
+        for start in range(first_row, engine.size, BUILD_CHUNK):
+            stop = min(start + BUILD_CHUNK, engine.size)
+            proj = self._project(engine, start, stop)
+            proj -= self._center
+            keys[start - first_row:stop - first_row] = self._pack(proj > 0)
+        return keys
+
+    def _pack(self, signs):
+        return signs.reshape(len(signs), self.tables, self.bits) @ self._weights
+
+    def extended(self, engine):
+        """
+        Return an index over `engine`, which must extend the engine this index
+        was built for. Only the new rows are hashed; they are merged into the
+        sorted tables.
+        """
+        start = time.perf_counter()
+        index = LSHIndex.__new__(LSHIndex)
+        index.__dict__.update(self.__dict__)
+        index._field_proj = dict(self._field_proj)
+        index.size = engine.size
+        keys = index._hash_rows(engine, self.size)
+        rows = np.arange(self.size, engine.size)
+        index._order, index._sorted_keys = [], []
+        for t in range(self.tables):
+            new_order = np.argsort(keys[:, t], kind="stable")
+            new_keys = keys[new_order, t]
+            pos = np.searchsorted(self._sorted_keys[t], new_keys, side="right")
+            index._sorted_keys.append(np.insert(self._sorted_keys[t], pos, new_keys))
+            index._order.append(np.insert(self._order[t], pos, rows[new_order]))
+        index.build_seconds = self.build_seconds + time.perf_counter() - start
+        return index
+
+    def _query_projection(self, engine, user):
+        proj = self._skill_proj[engine.skill_columns(user)].sum(axis=0)
+        for field, table in engine.field_tables(user).items():
+            # A constant added to a table is orthogonal to every centered
+            # internship vector, it would only blur the query direction
+            proj = proj + ((table - table.mean()) / FIELD_SCALE) @ self._field_proj[field]
+        return proj
+
+    def candidates(self, engine, user):
+        """Sorted indices of internships sharing a probed bucket with `user`."""
+        if self.size == 0:
+            return np.empty(0, dtype=np.intp)
+        proj = self._query_projection(engine, user).reshape(self.tables, self.bits)
+        keys = (proj > 0) @ self._weights
+        # Multi-probe: also visit the buckets one flip away on the least
+        # certain bits (smallest projection magnitude) of each table
+        probe_keys = [keys]
+        if self.probes:
+            uncertain = np.argsort(np.abs(proj), axis=1)[:, :self.probes]
+            for p in range(uncertain.shape[1]):
+                probe_keys.append(keys ^ self._weights[uncertain[:, p]])
+
+        found = []
+        for t in range(self.tables):
+            table_keys = np.array([k[t] for k in probe_keys])
+            lo = np.searchsorted(self._sorted_keys[t], table_keys, side="left")
+            hi = np.searchsorted(self._sorted_keys[t], table_keys, side="right")
+            found.extend(self._order[t][a:b] for a, b in zip(lo, hi) if b > a)
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(found))
+
+
+def recall_at_n(engine, index, users, top_n=10):
+    """
+    Mean recall@top_n of ANN retrieval plus exact re-ranking versus exact
+    scoring, and the mean candidate count. Ties are counted as hits: a
+    returned internship is correct if it scores at least the exact top_n-th
+    best score.
+    """
+    recalls, sizes = [], []
+    for user in users:
+        scores = engine.score(user)
+        n = min(top_n, len(scores))
+        if n == 0:
+            continue
+        cutoff = scores[top_n_indices(scores, n)[-1]]
+        candidates = index.candidates(engine, user)
+        approx = candidates[top_n_indices(engine.score(user, candidates), n)]
+        recalls.append(np.count_nonzero(scores[approx] >= cutoff) / n)
+        sizes.append(len(candidates))
+    return float(np.mean(recalls)), float(np.mean(sizes))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Recall and build-time report for the ANN recommendation mode
+
+Builds a synthetic catalog, indexes it with LSHIndex and compares ANN
+retrieval + exact re-ranking against exact scoring of the whole catalog.
+
+Usage:
+    python ann_benchmark.py --sizes 10000 100000 1000000 --users 200
+"""
+
+import argparse
+import random
+import time
+
+from ann import LSHIndex, recall_at_n
+from recommender import ScoringEngine, top_n_indices
+
+SKILLS = [f"skill{i}" for i in range(400)]
+EXPERIENCE_LEVELS = ["entry", "mid", "senior", "lead"]
+WORK_LOCATIONS = ["remote", "hybrid", "onsite", "flexible"]
+COMPANY_SIZES = ["startup", "small", "medium", "large", "enterprise"]
+JOB_TYPES = ["full-time", "part-time", "contract", "internship", "freelance"]
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Education", "Retail", "Media", "Energy"]
+
+
+def pick_skills(rng, low, high):
+    # Zipf-like popularity so a few skills are very common, like real listings
+    k = rng.randint(low, high)
+    return list({SKILLS[min(int(rng.paretovariate(1.2)) - 1, len(SKILLS) - 1)] for _ in range(k)})
+
+
+def synthetic_internships(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": i,
+            "skills": pick_skills(rng, 2, 8),
+            "experienceLevel": rng.choice(EXPERIENCE_LEVELS),
+            "workLocation": rng.choice(WORK_LOCATIONS),
+            "companySize": rng.choice(COMPANY_SIZES),
+            "jobType": rng.choice(JOB_TYPES),
+            "industry": rng.choice(INDUSTRIES),
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_users(n, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "technicalSkills": pick_skills(rng, 3, 10),
+            "experienceLevel": rng.choice(EXPERIENCE_LEVELS),
+            "workLocation": rng.choice(WORK_LOCATIONS),
+            "remoteWork": rng.random() < 0.5,
+            "willingToRelocate": rng.random() < 0.3,
+            "companySize": rng.choice(COMPANY_SIZES + [None]),
+            "jobType": rng.choice(JOB_TYPES + [None]),
+            "industryPreferences": rng.sample(INDUSTRIES, rng.randint(0, 2)),
+        }
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--tables", type=int, default=32)
+    parser.add_argument("--bits", type=int, default=None, help="default: scales with catalog size")
+    parser.add_argument("--probes", type=int, default=2)
+    args = parser.parse_args()
+
+    users = synthetic_users(args.users)
+    print(f"{'catalog':>9} {'build_s':>8} {'recall@' + str(args.top_n):>9} "
+          f"{'candidates':>10} {'exact_ms':>9} {'ann_ms':>7}")
+    for size in args.sizes:
+        engine = ScoringEngine(synthetic_internships(size))
+        index = LSHIndex(engine, args.tables, args.bits, args.probes)
+        recall, candidates = recall_at_n(engine, index, users, args.top_n)
+
+        start = time.perf_counter()
+        for user in users:
+            top_n_indices(engine.score(user), args.top_n)
+        exact_ms = (time.perf_counter() - start) * 1000 / len(users)
+
+        start = time.perf_counter()
+        for user in users:
+            rows = index.candidates(engine, user)
+            top_n_indices(engine.score(user, rows), args.top_n)
+        ann_ms = (time.perf_counter() - start) * 1000 / len(users)
+
+        print(f"{size:>9} {index.build_seconds:>8.2f} {recall:>9.3f} "
+              f"{candidates:>10.0f} {exact_ms:>9.2f} {ann_ms:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
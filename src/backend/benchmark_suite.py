@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for recommendation scoring and the main endpoint handlers
+
+Runs calculate_match_score, vectorized scoring, recommend, list_internships
+and register in-process against a memory_db stand-in database filled with
+synthetic_data records, at several catalog sizes. Results (median / p95 /
+mean milliseconds per operation) are written as JSON and compared against a
+stored baseline; any benchmark whose median is more than --tolerance slower
+than the baseline is flagged and the script exits with status 1.
+
+Usage:
+    python benchmark_suite.py --sizes 1000 10000 100000
+    python benchmark_suite.py --save-baseline       # record the baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# The handlers run against memory_db; the URI only has to parse, no
+# connection is ever made
+os.environ["MONGODB_URI"] = "mongodb://localhost:27017"
+
+import numpy as np  # noqa: E402
+
+import main  # noqa: E402
+import synthetic_data  # noqa: E402
+from memory_db import MemoryDatabase  # noqa: E402
+from recommender import calculate_match_score  # noqa: E402
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+# Medians below this many milliseconds apart are treated as noise
+NOISE_FLOOR_MS = 0.05
+
+USERS = 1000
+SEED = 0
+
+
+def summarize(samples_ms, ops_per_sample=1):
+    per_op = sorted(s / ops_per_sample for s in samples_ms)
+    return {
+        "samples": len(per_op),
+        "median_ms": round(statistics.median(per_op), 4),
+        "p95_ms": round(per_op[min(len(per_op) - 1, int(len(per_op) * 0.95))], 4),
+        "mean_ms": round(statistics.fmean(per_op), 4),
+    }
+
+
+async def timed(call):
+    start = time.perf_counter()
+    await call()
+    return (time.perf_counter() - start) * 1000
+
+
+async def load_database(size):
+    """A stand-in database with `size` internships and USERS users, wired into main."""
+    db = MemoryDatabase()
+    await db.internships.insert_many(list(synthetic_data.generate("internships", SEED, USERS, size)))
+    await db.users.insert_many(list(synthetic_data.generate("users", SEED, USERS, size)))
+
+    main.db = db
+    main.users_col = db.users
+    main.internships_col = db.internships
+    main.internships_browse_col = db.internships
+    main.applications_col = db.applications
+    main.recommendations_col = db.recommendations
+    main.catalog.collection = db.internships
+    main.catalog.invalidate()
+    main.recommend_cache.clear()
+    await main.ensure_indexes()
+    return db
+
+
+async def bench_match_score(db, repeat):
+    users = await db.users.find().limit(100).to_list()
+    internships = await db.internships.find().limit(200).to_list()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for user in users[:10]:
+            for internship in internships:
+                calculate_match_score(user, internship)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples, 10 * len(internships))
+
+
+async def bench_engine_score(db, repeat):
+    view = await main.catalog.get()
+    users = await db.users.find().limit(repeat).to_list()
+    view.engine  # built outside the timed region
+    samples = []
+    for user in users:
+        start = time.perf_counter()
+        view.engine.score(user)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+async def bench_recommend(db, repeat):
+    users = await db.users.find().limit(repeat + 1).to_list()
+    main.catalog.invalidate()
+    # First request loads the catalog and builds the scoring engine
+    cold = await timed(lambda: main.recommend(str(users[0]["_id"]), 10, "exact"))
+    samples = []
+    for user in users[1:]:
+        main.recommend_cache.clear()
+        samples.append(await timed(lambda: main.recommend(str(user["_id"]), 10, "exact")))
+    return {"recommend_cold": summarize([cold]), "recommend": summarize(samples)}
+
+
+async def bench_list_internships(db, repeat):
+    ids = db.internships._ids
+    middle = str(ids[len(ids) // 2])
+    cases = {
+        "list_internships_first_page": {},
+        "list_internships_deep_page": {"after": middle},
+        "list_internships_filtered": {"industry": "Technology", "workLocation": "remote"},
+    }
+    results = {}
+    for name, params in cases.items():
+        samples = [
+            await timed(lambda: main.list_internships(limit=50, **{
+                "after": None, "location": None, "workLocation": None, "jobType": None,
+                "industry": None, "experienceLevel": None, "companySize": None, "fields": None,
+                **params,
+            }))
+            for _ in range(repeat)
+        ]
+        results[name] = summarize(samples)
+    return results
+
+
+async def bench_register(db, repeat):
+    profiles = list(synthetic_data.generate("users", SEED + 1, repeat, 0))
+    samples = []
+    for profile in profiles:
+        fields = {k: v for k, v in profile.items() if k not in ("_id", "features")}
+        fields["email"] = f"bench.{profile['_id']}@example.com"
+        payload = main.RegisterRequest(**fields)
+        samples.append(await timed(lambda: main.register(payload)))
+    return summarize(samples)
+
+
+async def run(sizes, repeat):
+    results = {}
+    for size in sizes:
+        print(f"📦 catalog size {size}")
+        db = await load_database(size)
+        found = {
+            "calculate_match_score": await bench_match_score(db, repeat),
+            "engine_score": await bench_engine_score(db, repeat),
+            **await bench_recommend(db, repeat),
+            **await bench_list_internships(db, repeat),
+            "register": await bench_register(db, repeat),
+        }
+        for name, stats in found.items():
+            results[f"{name}[{size}]"] = stats
+            print(f"   {name:<30} median {stats['median_ms']:>10.4f} ms   p95 {stats['p95_ms']:>10.4f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against the baseline; return the regressed benchmark names."""
+    regressions = []
+    print(f"\n{'benchmark':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<44} {'-':>10} {stats['median_ms']:>10.4f} {'new':>8}")
+            continue
+        before, after = base["median_ms"], stats["median_ms"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > tolerance and after - before > NOISE_FLOOR_MS
+        flag = "  ❌ regression" if regressed else ""
+        print(f"{name:<44} {before:>10.4f} {after:>10.4f} {change:>+7.1%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50, help="timed samples per benchmark")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.sizes, args.repeat))
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,220 @@
+"""
+Process-local snapshot of the internship catalog
+
+The catalog is loaded from MongoDB once and served from memory. Writes made
+through this process call invalidate(), which bumps the catalog version so
+the next reader reloads, or add(), which appends new internships to the
+loaded snapshot and extends its scoring engine without refitting (unless a
+CatalogStore is used, see below). Writes made by other processes (seed
+scripts, other workers) are picked up when the snapshot is older than the
+configured TTL; if a cheap count + newest _id query shows the catalog
+unchanged, the loaded view and its engine are kept.
+
+With a CatalogStore (catalog_store.py) the scoring engine of each catalog
+version is memory-mapped from disk and shared by all worker processes
+instead of being built in every one. Local writes then reload the catalog in
+_id order, so the new version is stored and mapped as well.
+"""
+
+import asyncio
+import time
+
+from ann import LSHIndex
+from parallel import MappedCatalog, share
+from recommender import ScoringEngine
+from skill_index import SkillIndex
+
+
+def catalog_fingerprint(items):
+    """
+    Version of a catalog that any process can compute from the documents:
+    the internship count and the newest _id. Materialized recommendations
+    store it to detect that the catalog has changed since they were computed.
+    """
+    if not items:
+        return "0:"
+    return f"{len(items)}:{max(item['_id'] for item in items)}"
+
+
+class CatalogView:
+    """An immutable view of the catalog at one version."""
+
+    def __init__(self, items, version, text_weight=0.0, ann_options=None, skill_fallback=200, store=None):
+        self.items = items
+        self.version = version
+        self.text_weight = text_weight
+        self.ann_options = ann_options or {}
+        self.skill_fallback = skill_fallback
+        self.store = store
+        self._engine = None
+        self._ann_index = None
+        self._skill_index = None
+        self._shared = None
+        self._fingerprint = None
+        self._builds = {}  # attribute name -> future of its executor build
+
+    @property
+    def engine(self):
+        # Built on first use so list-only workloads never pay for it
+        if self._engine is None:
+            if self.store is not None:
+                self._engine = self.store.engine(self.items, self.fingerprint, self.text_weight)
+            else:
+                self._engine = ScoringEngine(self.items, text_weight=self.text_weight)
+        return self._engine
+
+    async def _build(self, name):
+        # The lazily built property `name`, built in a worker thread: for a
+        # large catalog that takes seconds and would otherwise block the event
+        # loop. Concurrent callers share one build.
+        if getattr(self, "_" + name) is None:
+            if name not in self._builds:
+                self._builds[name] = asyncio.get_running_loop().run_in_executor(None, getattr, self, name)
+            await self._builds[name]
+        return getattr(self, "_" + name)
+
+    async def load_engine(self):
+        """The engine (TF-IDF fit included), built off the event loop on first use."""
+        return await self._build("engine")
+
+    async def load_ann_index(self):
+        """The LSH index, built off the event loop on first use."""
+        # Its build reads the engine; building that here too would race load_engine()
+        await self.load_engine()
+        return await self._build("ann_index")
+
+    async def load_skill_index(self):
+        """The inverted skill index, built off the event loop on first use."""
+        await self.load_engine()
+        return await self._build("skill_index")
+
+    @property
+    def fingerprint(self):
+        """catalog_fingerprint() of the items, computed on first use."""
+        if self._fingerprint is None:
+            self._fingerprint = catalog_fingerprint(self.items)
+        return self._fingerprint
+
+    @property
+    def ann_index(self):
+        """LSHIndex over the engine, built on the first ANN-mode request."""
+        if self._ann_index is None:
+            self._ann_index = LSHIndex(self.engine, **self.ann_options)
+            print(f"Built ANN index over {self._ann_index.size} internships "
+                  f"in {self._ann_index.build_seconds:.2f}s")
+        return self._ann_index
+
+    @property
+    def skill_index(self):
+        """Inverted skill index over the engine, built on first use."""
+        if self._skill_index is None:
+            self._skill_index = SkillIndex(self.engine, fallback=self.skill_fallback)
+        return self._skill_index
+
+    @property
+    def shared(self):
+        """
+        Engine arrays for the parallel scoring workers: the store's files when
+        the engine was mapped from a CatalogStore, otherwise a shared memory
+        copy made on first use.
+        """
+        if self._shared is None:
+            if self.store is not None:
+                path = self.store.version_path(self.fingerprint, self.text_weight)
+                self._shared = MappedCatalog(self.engine, path)
+            else:
+                self._shared = share(self, self.engine)
+        return self._shared
+
+    def extended(self, docs, version):
+        """Return a view with `docs` appended, reusing already built structures."""
+        # No store: the appended items are not in _id order, so the rows would
+        # not line up with a stored version of the same fingerprint
+        view = CatalogView(self.items + docs, version, self.text_weight, self.ann_options, self.skill_fallback)
+        if self._engine is not None:
+            view._engine = self._engine.extended(docs)
+            if self._ann_index is not None:
+                view._ann_index = self._ann_index.extended(view._engine)
+            if self._skill_index is not None:
+                view._skill_index = self._skill_index.extended(view._engine)
+        return view
+
+
+class CatalogSnapshot:
+    def __init__(self, collection, ttl_seconds=60.0, text_weight=0.0, ann_options=None, skill_fallback=200,
+                 store=None):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.text_weight = text_weight
+        self.ann_options = ann_options
+        self.skill_fallback = skill_fallback
+        self.store = store
+        self.version = 0
+        self._view = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Bump the catalog version after a write so the next read reloads."""
+        self.version += 1
+
+    async def add(self, docs):
+        """
+        Record internships inserted by this process. If the loaded snapshot is
+        current they are appended to it; otherwise the next read reloads.
+        With a store the next read always reloads: an appended view would keep
+        a private engine copy instead of mapping the stored version.
+        """
+        if self.store is not None:
+            self.invalidate()
+            return
+        self.version += 1
+        version = self.version
+        # Readers wait for the extended view instead of reloading the catalog
+        async with self._lock:
+            view = self._view
+            if view is not None and view.version == version - 1 and view.items:
+                # Copies the engine matrices and LSH tables: off the event loop
+                self._view = await asyncio.get_running_loop().run_in_executor(
+                    None, view.extended, docs, version
+                )
+
+    def _is_fresh(self):
+        if self._view is None or self._view.version != self.version:
+            return False
+        if self.ttl_seconds <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def current_fingerprint(self):
+        """catalog_fingerprint() of the collection from a count and the newest _id."""
+        count = await self.collection.estimated_document_count()
+        newest = await self.collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        if not count or newest is None:
+            return "0:"
+        return f"{count}:{newest['_id']}"
+
+    async def get(self):
+        """Return the current CatalogView, reloading it if stale."""
+        if self._is_fresh():
+            return self._view
+        async with self._lock:
+            # Another request may have reloaded while we were waiting
+            if not self._is_fresh():
+                version = self.version
+                view = self._view
+                if (
+                    view is not None
+                    and view.version == version
+                    and await self.current_fingerprint() == view.fingerprint
+                ):
+                    # Only the TTL expired and nothing was written since
+                    self._loaded_at = time.monotonic()
+                    return view
+                # _id order, so every process numbers the engine rows alike
+                items = await self.collection.find().sort("_id", 1).to_list(length=None)
+                self._view = CatalogView(
+                    items, version, self.text_weight, self.ann_options, self.skill_fallback, self.store
+                )
+                self._loaded_at = time.monotonic()
+        return self._view
@@ -0,0 +1,96 @@
+"""
+Versioned on-disk scoring arrays shared by every worker process
+
+With several uvicorn workers each one would build and hold its own
+ScoringEngine. CatalogStore writes an engine's arrays (skill matrix, skill
+counts, categorical codes, TF-IDF matrix) once per catalog version as .npy
+files and every worker opens them with np.load(mmap_mode="r"): the arrays
+live in the OS page cache once, however many workers map them.
+
+A version is a directory named after the catalog fingerprint and text
+weight. It is written under a temporary name and published with a single
+rename, so a worker sees either no version or a complete one; when its
+catalog reload produces a new fingerprint it simply maps the new directory.
+Old versions beyond `keep` are deleted; workers still mapping them keep
+reading the unlinked files until they switch.
+"""
+
+import os
+import pickle
+import shutil
+import uuid
+
+import numpy as np
+
+from recommender import ScoringEngine
+
+# Bumped when the file layout or engine state changes, so old directories are ignored
+STORE_FORMAT = 1
+
+STATE_FILE = "state.pickle"
+
+
+def array_path(version_path, array_name):
+    # "codes:industry" -> "codes.industry.npy" (":" is not valid on Windows)
+    return os.path.join(version_path, array_name.replace(":", ".") + ".npy")
+
+
+class CatalogStore:
+    def __init__(self, directory, keep=3):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def version_name(self, fingerprint, text_weight):
+        return f"v{STORE_FORMAT}-{fingerprint.replace(':', '-')}-tw{text_weight:g}"
+
+    def version_path(self, fingerprint, text_weight):
+        return os.path.join(self.directory, self.version_name(fingerprint, text_weight))
+
+    def engine(self, items, fingerprint, text_weight):
+        """
+        A memory-mapped ScoringEngine for `items`, built and published first if
+        no process has stored this catalog version yet. `items` must be in the
+        same order in every process (the catalog loads them sorted by _id).
+        """
+        path = self.version_path(fingerprint, text_weight)
+        if not os.path.exists(os.path.join(path, STATE_FILE)):
+            self._publish(ScoringEngine(items, text_weight=text_weight), path)
+        return self.open(path)
+
+    def open(self, path):
+        with open(os.path.join(path, STATE_FILE), "rb") as f:
+            state = pickle.load(f)
+        arrays = {
+            name: np.load(array_path(path, name), mmap_mode="r")
+            for name in state["arrays"]
+        }
+        return ScoringEngine.from_arrays(arrays, state)
+
+    def _publish(self, engine, path):
+        tmp = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            arrays = engine.arrays()
+            for name, array in arrays.items():
+                np.save(array_path(tmp, name), np.ascontiguousarray(array))
+            # Written last: its presence marks a complete version
+            with open(os.path.join(tmp, STATE_FILE), "wb") as f:
+                pickle.dump({**engine.state(), "arrays": list(arrays)}, f)
+            os.rename(tmp, path)
+            print(f"💾 Stored catalog arrays {os.path.basename(path)} ({engine.size} internships)")
+        except OSError:
+            # Another worker published the same version first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, STATE_FILE)):
+                raise
+        self._prune()
+
+    def _prune(self):
+        versions = [
+            entry for entry in os.scandir(self.directory)
+            if entry.is_dir() and entry.name.startswith("v")
+        ]
+        versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in versions[self.keep:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -15,9 +15,113 @@ MONGODB_URI = os.getenv(
 # Database name
 DATABASE_NAME = "aiintern"
 
+# MongoDB client settings: environment variable -> (MongoClient option, type).
+# Only variables that are set are passed to the client, so pymongo's
+# defaults and options in the MONGODB_URI query string apply otherwise
+# (keyword options take precedence over the URI).
+#   MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE     connections per server (100 / 0)
+#   MONGO_COMPRESSORS                             preference list of zstd, snappy, zlib
+#                                                 (zstd and snappy need pymongo's optional
+#                                                 compression packages)
+#   MONGO_SERVER_SELECTION_TIMEOUT_MS             30000
+#   MONGO_CONNECT_TIMEOUT_MS                      20000
+#   MONGO_SOCKET_TIMEOUT_MS                       no timeout
+#   MONGO_READ_PREFERENCE                         primary, primaryPreferred, secondary,
+#                                                 secondaryPreferred or nearest
+MONGO_CLIENT_SETTINGS = {
+    "MONGO_MAX_POOL_SIZE": ("maxPoolSize", int),
+    "MONGO_MIN_POOL_SIZE": ("minPoolSize", int),
+    "MONGO_COMPRESSORS": ("compressors", str),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": ("serverSelectionTimeoutMS", int),
+    "MONGO_CONNECT_TIMEOUT_MS": ("connectTimeoutMS", int),
+    "MONGO_SOCKET_TIMEOUT_MS": ("socketTimeoutMS", int),
+    "MONGO_READ_PREFERENCE": ("readPreference", str),
+}
+MONGO_CLIENT_OPTIONS = {
+    option: cast(os.environ[name])
+    for name, (option, cast) in MONGO_CLIENT_SETTINGS.items()
+    if os.getenv(name)
+}
+
+# Read preference of the read-heavy internship browsing endpoints (GET
+# /internships and /internships/{id}); unset, they follow the client's.
+# secondaryPreferred or nearest takes them off the primary, at the cost of
+# listings lagging recent writes by the replication delay.
+MONGO_BROWSE_READ_PREFERENCE = os.getenv("MONGO_BROWSE_READ_PREFERENCE")
+
 # Collection names
 COLLECTIONS = {
     "users": "users",
     "internships": "internships", 
-    "applications": "applications"
+    "applications": "applications",
+    "recommendations": "recommendations"
 }
+
+# Seconds an in-memory internship catalog snapshot is served before it is
+# reloaded, so writes made by other processes become visible. 0 disables
+# the time-based refresh (writes through the API still invalidate it).
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "60"))
+
+# Share of the recommendation score given to TF-IDF similarity between the
+# user's bio/skills and the internship description and requirements. 0 keeps
+# the plain six-factor score.
+TEXT_MATCH_WEIGHT = float(os.getenv("TEXT_MATCH_WEIGHT", "0.1"))
+
+# Default /recommendations mode: "exact" scores the whole catalog, "ann"
+# scores only candidates from the LSH index (see ann.py) and "skills" only
+# internships sharing a skill with the user (see skill_index.py). Clients can
+# override it per request with ?mode=.
+RECOMMEND_MODE = os.getenv("RECOMMEND_MODE", "exact")
+ANN_TABLES = int(os.getenv("ANN_TABLES", "32"))
+ANN_PROBES = int(os.getenv("ANN_PROBES", "2"))
+
+# Newest internships always scored in "skills" mode, so listings without
+# skill overlap (and users without skills) still get recommendations
+SKILL_FALLBACK_POOL = int(os.getenv("SKILL_FALLBACK_POOL", "200"))
+
+# Per-user cache of ranked /recommendations results (LRU + TTL); 0 entries
+# disables it. Entries are keyed on the catalog fingerprint, so they retire
+# when any process changes the catalog. A profile update only drops the entry
+# in the worker that handled it: with several workers the others can serve
+# the old ranking for up to RECOMMEND_CACHE_TTL_SECONDS.
+RECOMMEND_CACHE_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", "10000"))
+RECOMMEND_CACHE_TTL_SECONDS = float(os.getenv("RECOMMEND_CACHE_TTL_SECONDS", "60"))
+
+# Score matrix elements (users x internships) per score_many() call in
+# /recommendations/batch and materialize_recommendations.py. score_many()
+# holds a few float64 arrays of this size at once, so 8M elements is roughly
+# 64 MB each, whatever the catalog size.
+BATCH_SCORING_BUDGET = int(os.getenv("BATCH_SCORING_BUDGET", "8000000"))
+
+# Exact-mode scoring of large catalogs is split across a pool of worker
+# processes that read the catalog arrays from shared memory (see parallel.py).
+# Only used for catalogs of at least PARALLEL_SCORING_MIN_CATALOG internships;
+# 1 worker (the default) disables it. Every server process starts its own
+# pool, so with several uvicorn workers set it to about the CPU count divided
+# by the uvicorn worker count.
+PARALLEL_SCORING_WORKERS = int(os.getenv("PARALLEL_SCORING_WORKERS", "1"))
+PARALLEL_SCORING_MIN_CATALOG = int(os.getenv("PARALLEL_SCORING_MIN_CATALOG", "200000"))
+
+# Directory where the scoring arrays of each catalog version are stored and
+# memory-mapped by every worker process (see catalog_store.py), so several
+# uvicorn workers share one copy. Empty keeps a private engine per process.
+# CATALOG_STORE_KEEP versions are kept on disk.
+CATALOG_STORE_DIR = os.getenv("CATALOG_STORE_DIR", "")
+CATALOG_STORE_KEEP = int(os.getenv("CATALOG_STORE_KEEP", "3"))
+
+# Materialized recommendations written by materialize_recommendations.py:
+# top-K per user, served by /recommendations while the catalog is unchanged
+# and the entry is younger than MATERIALIZED_MAX_AGE_SECONDS (0 disables
+# serving them).
+MATERIALIZED_TOP_K = int(os.getenv("MATERIALIZED_TOP_K", "50"))
+MATERIALIZED_MAX_AGE_SECONDS = float(os.getenv("MATERIALIZED_MAX_AGE_SECONDS", "86400"))
+
+# MongoDB commands slower than this many milliseconds are logged with their
+# collection, filter fields and originating route (see db_monitoring.py).
+# 0 disables the log; per-command metrics are always collected.
+MONGO_SLOW_OPERATION_MS = float(os.getenv("MONGO_SLOW_OPERATION_MS", "100"))
+
+# Load the recommendation catalog and build the scoring engine during startup,
+# before the app accepts requests, instead of on the first /recommendations
+# call. Slower to become ready, but no cold first request.
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,111 @@
+"""
+MongoDB command monitoring
+
+CommandMonitor is a pymongo CommandListener registered on the Motor client.
+For every command it records the duration, the number of documents returned
+(cursor batch size for find/aggregate/getMore, `n` for writes and counts)
+and the route of the HTTP request that issued it, and prints a line for
+commands slower than the configured threshold.
+
+Motor runs pymongo calls in a thread pool but copies the caller's context
+into the worker, so `metrics.current_request` is visible to the listener:
+commands are attributed to the request's route and added to its totals,
+which MetricsMiddleware records per route. Commands issued outside a
+request (startup, background reloads) are reported under "<background>".
+"""
+
+import threading
+
+from pymongo import monitoring
+
+from metrics import current_request, format_labels
+
+BACKGROUND_ROUTE = "<background>"
+
+# Connection handshakes and session cleanup, not application queries
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions"}
+
+
+def command_collection(command_name, command):
+    # getMore names its cursor id first; the collection is a separate field
+    target = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+def documents_returned(reply):
+    cursor = reply.get("cursor")
+    if cursor is not None:
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+    return reply.get("n", 0)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    def __init__(self, slow_ms=100.0):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._started = {}  # (connection_id, request_id) -> (collection, filter keys)
+        self.commands = {}  # (command, collection, route) -> [count, failures, seconds, documents]
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        command = event.command
+        statements = command.get("updates") or command.get("deletes")
+        query = statements[0].get("q") if statements else command.get("filter") or command.get("query")
+        self._started[(event.connection_id, event.request_id)] = (
+            command_collection(event.command_name, command),
+            tuple(query) if isinstance(query, dict) else (),
+        )
+
+    def succeeded(self, event):
+        self._finish(event, documents_returned(event.reply), failed=False)
+
+    def failed(self, event):
+        self._finish(event, 0, failed=True)
+
+    def _finish(self, event, documents, failed):
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        collection, filter_keys = started
+        seconds = event.duration_micros / 1e6
+        request = current_request.get()
+        route = request.route if request is not None else BACKGROUND_ROUTE
+
+        with self._lock:
+            key = (event.command_name, collection, route)
+            totals = self.commands.get(key)
+            if totals is None:
+                totals = self.commands[key] = [0, 0, 0.0, 0]
+            totals[0] += 1
+            totals[1] += failed
+            totals[2] += seconds
+            totals[3] += documents
+            if request is not None:
+                request.db_commands += 1
+                request.db_seconds += seconds
+
+        if self.slow_ms > 0 and seconds * 1000 >= self.slow_ms:
+            # Filter field names only; values may be personal data
+            status = "failed" if failed else f"{documents} docs"
+            print(
+                f"🐢 Slow MongoDB {event.command_name} on {collection or event.database_name} "
+                f"took {seconds * 1000:.1f} ms ({status}, filter {list(filter_keys)}) for {route}"
+            )
+
+    def render(self):
+        with self._lock:
+            rows = sorted((key, list(totals)) for key, totals in self.commands.items())
+        metrics = (
+            ("mongodb_commands_total", "counter", "MongoDB commands by command, collection and route.", 0, "{}"),
+            ("mongodb_command_failures_total", "counter", "Failed MongoDB commands.", 1, "{}"),
+            ("mongodb_command_seconds_total", "counter", "Time spent in MongoDB commands.", 2, "{:.6f}"),
+            ("mongodb_documents_returned_total", "counter", "Documents returned or written by MongoDB commands.", 3, "{}"),
+        )
+        lines = []
+        for name, kind, help_text, column, fmt in metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for (command, collection, route), totals in rows:
+                labels = format_labels(command=command, collection=collection, route=route)
+                lines.append(f"{name}{{{labels}}} {fmt.format(totals[column])}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Remove duplicate applications before the unique application index is built
+
+POST /apply used to insert a new application every time it was called, so
+databases written before the unique (user_id, internship_id) index can hold
+several applications of one user to the same internship, and the server
+then fails to start. This one-off migration keeps the oldest application of
+each pair (the lowest _id) and deletes the rest in batched bulk writes.
+
+Usage:
+    python dedupe_applications.py --dry-run
+    python dedupe_applications.py [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+import motor.motor_asyncio
+from pymongo import DeleteMany
+
+from config import MONGODB_URI
+
+client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+db = client.aiintern
+applications_col = db.applications
+
+# (user_id, internship_id) pairs applied to more than once, with the _ids of
+# all their applications oldest first
+DUPLICATES_PIPELINE = [
+    {"$sort": {"_id": 1}},
+    {"$group": {
+        "_id": {"user_id": "$user_id", "internship_id": "$internship_id"},
+        "ids": {"$push": "$_id"},
+        "count": {"$sum": 1},
+    }},
+    {"$match": {"count": {"$gt": 1}}},
+]
+
+
+async def dedupe(batch_size, dry_run):
+    pairs = deleted = 0
+    batch = []
+    cursor = applications_col.aggregate(DUPLICATES_PIPELINE, allowDiskUse=True)
+    async for group in cursor:
+        pairs += 1
+        extra = group["ids"][1:]
+        if dry_run:
+            deleted += len(extra)
+            continue
+        batch.append(DeleteMany({"_id": {"$in": extra}}))
+        if len(batch) >= batch_size:
+            result = await applications_col.bulk_write(batch, ordered=False)
+            deleted += result.deleted_count
+            batch = []
+            print(f"   ... {deleted} duplicates deleted")
+    if batch:
+        result = await applications_col.bulk_write(batch, ordered=False)
+        deleted += result.deleted_count
+    if dry_run:
+        print(f"🔎 {pairs} user/internship pairs have {deleted} duplicate applications (nothing deleted)")
+    else:
+        print(f"✅ Deleted {deleted} duplicate applications of {pairs} user/internship pairs")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate applications")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="only count the duplicates")
+    args = parser.parse_args()
+    try:
+        await dedupe(args.batch_size, args.dry_run)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP load generator for a running backend
+
+Drives a weighted mix of /register, /login, /internships and
+/recommendations against a local instance and reports throughput, error
+rate and p50/p95/p99 latency per endpoint.
+
+Two load models:
+  --concurrency N          closed loop: N clients each send their next
+                           request as soon as the previous one completes
+  --rate R                 open loop: R requests/second are scheduled on a
+                           fixed timetable over --concurrency connections;
+                           latency is measured from the scheduled start, so
+                           time spent queued behind a slow server counts
+                           (no coordinated omission)
+
+Before the run, --setup-users users are registered so /login and
+/recommendations have real accounts to use. Uses plain asyncio streams with
+keep-alive connections; no client library is needed.
+
+Usage:
+    python load_test.py --duration 30 --concurrency 50
+    python load_test.py --rate 200 --mix register=1,login=2,internships=5,recommendations=2
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+import synthetic_data
+
+ENDPOINTS = ("register", "login", "internships", "recommendations")
+DEFAULT_MIX = "register=1,login=3,internships=4,recommendations=2"
+
+# Distinct generated profiles cycled through by /register (with fresh emails),
+# built before the run so generation never stalls the event loop mid-test
+PROFILE_POOL = 1000
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port, ssl, timeout):
+        self.host, self.port, self.ssl, self.timeout = host, port, ssl, timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        try:
+            return await asyncio.wait_for(self._request(method, path, body), self.timeout)
+        except BaseException:
+            # Drop the connection, a partially read response would poison it
+            await self.close()
+            raise
+
+    async def _request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        payload = b"" if body is None else json.dumps(body).encode()
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            + ("Content-Type: application/json\r\n" if body is not None else "")
+            + "\r\n"
+        )
+        self.writer.write(head.encode() + payload)
+        await self.writer.drain()
+
+        status = int((await self.reader.readuntil(b"\r\n")).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            data = b""
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                data += await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+
+class Scenario:
+    """Builds the requests of the mix, sharing the accounts created so far."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.profiles = itertools.cycle(synthetic_data.user_block(seed, 0, PROFILE_POOL))
+        self.counter = itertools.count()
+        self.users = []  # (user_id, email)
+        self.next_after = None
+
+    def register(self):
+        profile = next(self.profiles)
+        body = {k: v for k, v in profile.items() if k not in ("_id", "features")}
+        body["email"] = f"load.{self.run_id}.{next(self.counter)}@example.com"
+        return "POST", "/register", body
+
+    def login(self):
+        _, email = self.rng.choice(self.users)
+        return "POST", "/login", {"email": email}
+
+    def internships(self):
+        params = {"limit": 50}
+        roll = self.rng.random()
+        if roll < 0.3 and self.next_after:
+            params["after"] = self.next_after
+        elif roll < 0.6:
+            params["industry"] = self.rng.choice(["Technology", "Fintech", "Cloud Computing", "Gaming"])
+        return "GET", "/internships?" + urlencode(params), None
+
+    def recommendations(self):
+        user_id, _ = self.rng.choice(self.users)
+        return "GET", "/recommendations?" + urlencode({"user_id": user_id, "top_n": 10}), None
+
+    def record(self, endpoint, status, body, request):
+        """Remember new accounts and pagination cursors from responses."""
+        if status != 200:
+            return
+        if endpoint == "register":
+            self.users.append((json.loads(body)["user_id"], request[2]["email"]))
+        elif endpoint == "internships":
+            self.next_after = json.loads(body).get("next_after")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, endpoint, latency_ms, ok):
+        self.latencies.setdefault(endpoint, []).append(latency_ms)
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + (not ok)
+
+    def report(self, elapsed):
+        rows = {}
+        everything = []
+        for endpoint, latencies in sorted(self.latencies.items()):
+            rows[endpoint] = summarize(latencies, self.errors[endpoint], elapsed)
+            everything += latencies
+        if everything:
+            rows["all"] = summarize(everything, sum(self.errors.values()), elapsed)
+        return rows
+
+
+def percentile(ordered, p):
+    # Nearest-rank percentile of an already sorted list
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 1),
+        "error_rate": round(errors / len(ordered), 4),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint in --mix: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def send(connection, scenario, stats, endpoint, started):
+    request = getattr(scenario, endpoint)()
+    try:
+        status, body = await connection.request(*request)
+        ok = status < 400
+        scenario.record(endpoint, status, body, request)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+        ok = False
+    stats.add(endpoint, (time.perf_counter() - started) * 1000, ok)
+
+
+def pick(scenario, mix):
+    endpoints = [e for e in mix if scenario.users or e not in ("login", "recommendations")]
+    return scenario.rng.choices(endpoints, [mix[e] for e in endpoints])[0]
+
+
+async def closed_loop(connections, scenario, stats, mix, deadline):
+    async def client(connection):
+        while time.perf_counter() < deadline:
+            await send(connection, scenario, stats, pick(scenario, mix), time.perf_counter())
+
+    await asyncio.gather(*(client(c) for c in connections))
+
+
+async def open_loop(connections, scenario, stats, mix, deadline, rate):
+    idle = asyncio.Queue()
+    for connection in connections:
+        idle.put_nowait(connection)
+
+    async def arrival(endpoint, scheduled):
+        connection = await idle.get()
+        try:
+            await send(connection, scenario, stats, endpoint, scheduled)
+        finally:
+            idle.put_nowait(connection)
+
+    tasks = []
+    start = time.perf_counter()
+    for n in itertools.count():
+        scheduled = start + n / rate
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(arrival(pick(scenario, mix), scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    ssl = url.scheme == "https"
+    port = url.port or (443 if ssl else 80)
+    connections = [Connection(url.hostname, port, ssl, args.timeout) for _ in range(args.concurrency)]
+    scenario = Scenario(args.seed)
+    mix = parse_mix(args.mix)
+
+    print(f"👥 Registering {args.setup_users} users for login/recommendations ...")
+    setup = Stats()
+    for _ in range(args.setup_users):
+        await send(connections[0], scenario, setup, "register", time.perf_counter())
+    if not scenario.users:
+        raise SystemExit(f"❌ Could not register users against {args.url}; is the server running?")
+
+    model = f"{args.rate} req/s open loop" if args.rate else f"{args.concurrency} clients closed loop"
+    print(f"🚀 {args.duration}s at {model}, mix {mix}")
+    stats = Stats()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    if args.rate:
+        await open_loop(connections, scenario, stats, mix, deadline, args.rate)
+    else:
+        await closed_loop(connections, scenario, stats, mix, deadline)
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    return stats.report(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=20, help="connections (and clients in closed loop)")
+    parser.add_argument("--rate", type=float, default=None, help="target requests/second (open loop)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,... of register, login, internships, recommendations")
+    parser.add_argument("--setup-users", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(f"\n{'endpoint':<16} {'requests':>8} {'rps':>8} {'errors':>7} "
+          f"{'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'max_ms':>8}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<16} {row['requests']:>8} {row['throughput_rps']:>8.1f} {row['error_rate']:>7.2%} "
+              f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['max_ms']:>8.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,116 @@
+import asyncio
+import time
+
+# Module import time is part of the startup breakdown
+IMPORT_STARTED = time.perf_counter()
 
 import os
-from fastapi import FastAPI, HTTPException, Body
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from fastapi import APIRouter, FastAPI, HTTPException, Body, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 import motor.motor_asyncio
+import orjson
 from bson import ObjectId
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from pymongo import ASCENDING, IndexModel, ReadPreference
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from typing import List, Optional
 
-from config import MONGODB_URI
+from config import (
+    MONGODB_URI,
+    MONGO_CLIENT_OPTIONS,
+    MONGO_BROWSE_READ_PREFERENCE,
+    CATALOG_TTL_SECONDS,
+    TEXT_MATCH_WEIGHT,
+    RECOMMEND_MODE,
+    ANN_TABLES,
+    ANN_PROBES,
+    SKILL_FALLBACK_POOL,
+    RECOMMEND_CACHE_SIZE,
+    RECOMMEND_CACHE_TTL_SECONDS,
+    BATCH_SCORING_BUDGET,
+    PARALLEL_SCORING_WORKERS,
+    PARALLEL_SCORING_MIN_CATALOG,
+    CATALOG_STORE_DIR,
+    CATALOG_STORE_KEEP,
+    MATERIALIZED_MAX_AGE_SECONDS,
+    MONGO_SLOW_OPERATION_MS,
+    WARM_UP_ON_STARTUP,
+)
+from cache import LRUCache
+from catalog import CatalogSnapshot
+from catalog_store import CatalogStore
+from db_monitoring import CommandMonitor
+from metrics import HTTPMetrics, MetricsMiddleware
+from parallel import ParallelScorer
+from recommender import compute_user_features, recommendation_item, top_n_indices
+from responses import MongoJSONResponse, dumps
+
+# Per-command duration, documents returned and originating route, served at
+# /metrics; slow commands are logged
+mongo_monitor = CommandMonitor(slow_ms=MONGO_SLOW_OPERATION_MS)
+
+# MongoDB handles, set by connect() when the app starts (see lifespan)
+client = db = users_col = internships_col = applications_col = recommendations_col = None
+internships_browse_col = None
+
+# MONGO_BROWSE_READ_PREFERENCE names
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+catalog = CatalogSnapshot(
+    None,
+    ttl_seconds=CATALOG_TTL_SECONDS,
+    text_weight=TEXT_MATCH_WEIGHT,
+    ann_options={"tables": ANN_TABLES, "probes": ANN_PROBES},
+    skill_fallback=SKILL_FALLBACK_POOL,
+    # Scoring arrays memory-mapped from disk and shared by all workers
+    store=CatalogStore(CATALOG_STORE_DIR, CATALOG_STORE_KEEP) if CATALOG_STORE_DIR else None,
+)
+# Ranked /recommendations results keyed by (user_id, top_n, mode, catalog fingerprint)
+recommend_cache = LRUCache(RECOMMEND_CACHE_SIZE, RECOMMEND_CACHE_TTL_SECONDS)
+# Worker processes for exact scoring of large catalogs, started on first use
+parallel_scorer = ParallelScorer(PARALLEL_SCORING_WORKERS, PARALLEL_SCORING_MIN_CATALOG)
+
 
-# Initialize MongoDB connection
-try:
-    client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
-    db = client.aiintern
-    users_col = db.users
-    internships_col = db.internships
-    applications_col = db.applications
-    print("✅ MongoDB Atlas connected successfully")
-except Exception as e:
-    print(f"❌ MongoDB connection failed: {e}")
-    print("Please check your MongoDB Atlas connection string in config.py")
-    raise e
+def connect():
+    """Open the Motor client and bind the collection handles."""
+    global client, db, users_col, internships_col, applications_col, recommendations_col
+    global internships_browse_col
+    try:
+        client = motor.motor_asyncio.AsyncIOMotorClient(
+            MONGODB_URI, event_listeners=[mongo_monitor], **MONGO_CLIENT_OPTIONS
+        )
+        db = client.aiintern
+        users_col = db.users
+        internships_col = db.internships
+        applications_col = db.applications
+        # Per-user top-K written offline by materialize_recommendations.py
+        recommendations_col = db.recommendations
+        # GET /internships and /internships/{id}, optionally served by secondaries
+        internships_browse_col = internships_col
+        if MONGO_BROWSE_READ_PREFERENCE:
+            if MONGO_BROWSE_READ_PREFERENCE not in READ_PREFERENCES:
+                raise ValueError(f"MONGO_BROWSE_READ_PREFERENCE must be one of {', '.join(READ_PREFERENCES)}")
+            internships_browse_col = internships_col.with_options(
+                read_preference=READ_PREFERENCES[MONGO_BROWSE_READ_PREFERENCE]
+            )
+        catalog.collection = internships_col
+        print("✅ MongoDB Atlas connected successfully")
+    except Exception as e:
+        print(f"❌ MongoDB connection failed: {e}")
+        print("Please check your MongoDB Atlas connection string in config.py")
+        raise e
 
-app = FastAPI()
+
+router = APIRouter()
 
 # Configure CORS origins from environment so deployments (Render + Vercel)
 # can set the correct frontend origin without editing code.
@@ -45,23 +130,54 @@ allow_credentials = True
 if "*" in allowed_origins:
     allow_credentials = False
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=allow_credentials,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Per-route request counts, status codes and latency histograms, served at
+# /metrics
+http_metrics = HTTPMetrics()
 
-print(f"Configured CORS allowed origins: {allowed_origins}, allow_credentials={allow_credentials}")
+# Seconds spent in each startup phase, filled in by create_app() and lifespan
+startup_timings = {}
 
 
-@app.get("/_cors")
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition format."""
+    return PlainTextResponse(http_metrics.render() + mongo_monitor.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/_cors")
 async def cors_info():
     """Simple endpoint to return current CORS configuration for debugging deployments."""
     return {"allowed_origins": allowed_origins, "allow_credentials": allow_credentials}
 
 
+@router.get("/_startup")
+async def startup_info():
+    """Milliseconds spent in each startup phase of this process."""
+    return {name: round(seconds * 1000, 1) for name, seconds in startup_timings.items()}
+
+
+# Candidate generation work per /recommendations mode: how many internships
+# were scored versus the catalog size at the time of the request
+RECOMMEND_MODES = ("exact", "ann", "skills")
+recommend_stats = {mode: {"requests": 0, "scored": 0, "catalog": 0} for mode in RECOMMEND_MODES}
+materialized_stats = {"served": 0, "stale": 0, "missing": 0}
+
+
+@router.get("/_recommender")
+async def recommender_info():
+    """Candidate counts per recommendation mode, to see how much work is skipped."""
+    stats = {}
+    for mode, counts in recommend_stats.items():
+        skipped = 1 - counts["scored"] / counts["catalog"] if counts["catalog"] else 0.0
+        stats[mode] = {**counts, "skipped_fraction": round(skipped, 4)}
+    return {
+        "default_mode": RECOMMEND_MODE,
+        "modes": stats,
+        "cache": recommend_cache.stats(),
+        "materialized": materialized_stats,
+    }
+
+
 class PyObjectId(ObjectId):
     @classmethod
     def __get_validators__(cls):
@@ -160,26 +276,148 @@ class InternshipIn(BaseModel):
     startDate: Optional[str] = None
 
 
-@app.post("/register")
+class BatchRecommendationRequest(BaseModel):
+    user_ids: List[str]
+    top_n: int = 10
+
+
+class BulkApplyRequest(BaseModel):
+    user_id: str
+    internship_ids: List[str]
+
+
+# Filters accepted by GET /internships. Each has a compound (field, _id)
+# index, so a page with one filter is a bounded index scan in _id order. With
+# several filters the planner scans one of these indexes and applies the
+# others as a filter on the fetched documents, which can read many more
+# entries than the page holds for rare combinations.
+INTERNSHIP_FILTER_FIELDS = (
+    "location", "workLocation", "jobType", "industry", "experienceLevel", "companySize"
+)
+
+# Indexes ensured at startup, per collection
+INDEXES = {
+    "users": [IndexModel([("email", ASCENDING)], unique=True)],
+    "internships": [
+        IndexModel([(field, ASCENDING), ("_id", ASCENDING)]) for field in INTERNSHIP_FILTER_FIELDS
+    ],
+    # One application per user and internship, so repeated applies are
+    # idempotent; its user_id prefix also serves GET /users/{id}/applications
+    "applications": [
+        IndexModel([("user_id", ASCENDING), ("internship_id", ASCENDING)], unique=True)
+    ],
+}
+
+# Collections whose unique indexes the handlers rely on for correctness
+# (register() and the apply endpoints have no duplicate check of their own):
+# startup fails without them. Values say how to remove existing duplicates.
+REQUIRED_INDEXES = {
+    "users": "remove or merge the accounts that share an email",
+    "applications": "run dedupe_applications.py",
+}
+
+
+async def ensure_indexes():
+    # create_indexes is a no-op for indexes that already exist
+    for name, indexes in INDEXES.items():
+        try:
+            await db[name].create_indexes(indexes)
+        except Exception as e:
+            print(f"❌ Could not create indexes on {name}: {e}")
+            if name in REQUIRED_INDEXES:
+                raise RuntimeError(
+                    f"Required indexes on {name} are missing; resolve the error above "
+                    f"(for duplicate keys: {REQUIRED_INDEXES[name]}) and restart"
+                ) from e
+
+
+async def warm_up():
+    """
+    Load the catalog and build the scoring engine (the first use of the
+    TF-IDF vectorizer imports scikit-learn) and the default mode's candidate
+    index, so the first /recommendations request does not pay for it.
+    """
+    view = await catalog.get()
+    await view.load_engine()
+    if RECOMMEND_MODE == "ann":
+        await view.load_ann_index()
+    elif RECOMMEND_MODE == "skills":
+        await view.load_skill_index()
+    print(f"🔥 Warmed up recommendation catalog ({len(view.items)} internships)")
+
+
+@contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
+    yield
+    startup_timings[name] = time.perf_counter() - start
+
+
+@asynccontextmanager
+async def lifespan(app):
+    with startup_phase("mongo_client"):
+        connect()
+    with startup_phase("indexes"):
+        await ensure_indexes()
+    if WARM_UP_ON_STARTUP:
+        with startup_phase("warm_up"):
+            await warm_up()
+    startup_timings["total"] = time.perf_counter() - IMPORT_STARTED
+    print("⏱️  Startup " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in startup_timings.items()))
+    yield
+    parallel_scorer.shutdown()
+    client.close()
+
+
+def create_app():
+    """
+    Build the FastAPI app. MongoDB is connected and indexes are ensured in
+    the lifespan, not at import; with WARM_UP_ON_STARTUP the recommendation
+    catalog is also loaded before the app reports ready.
+    """
+    start = time.perf_counter()
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=allow_credentials,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    print(f"Configured CORS allowed origins: {allowed_origins}, allow_credentials={allow_credentials}")
+    # Added last so it is the outermost middleware and times the full request
+    app.add_middleware(MetricsMiddleware, metrics=http_metrics)
+    app.include_router(router)
+    startup_timings["imports"] = start - IMPORT_STARTED
+    startup_timings["create_app"] = time.perf_counter() - start
+    return app
+
+
+# Profile fields returned by the API; the derived matching features stored
+# alongside the profile are internal
+USER_PROJECTION = {"features": 0}
+
+
+@router.post("/register")
 async def register(payload: RegisterRequest):
     doc = payload.dict()
-    existing = await users_col.find_one({"email": doc["email"]})
-    if existing:
+    doc["features"] = compute_user_features(doc)
+    # The unique email index rejects duplicates, also under concurrent signups
+    try:
+        res = await users_col.insert_one(doc)
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Email already registered")
-    res = await users_col.insert_one(doc)
     return {"user_id": str(res.inserted_id)}
 
 
-@app.post("/login")
+@router.post("/login", response_class=MongoJSONResponse)
 async def login(payload: LoginRequest):
     try:
-        user = await users_col.find_one({"email": payload.email})
+        user = await users_col.find_one({"email": payload.email}, USER_PROJECTION)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Convert ObjectId to string and return user data
-        user["_id"] = str(user["_id"])
-        return user
+        return MongoJSONResponse(user)
     except HTTPException:
         # Re-raise FastAPI HTTPExceptions unchanged
         raise
@@ -193,59 +431,144 @@ async def login(payload: LoginRequest):
         raise HTTPException(status_code=500, detail=tb)
 
 
-@app.get("/users/{user_id}")
+@router.get("/users/{user_id}", response_class=MongoJSONResponse)
 async def get_user(user_id: str):
     try:
         oid = PyObjectId.validate(user_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid user id")
-    user = await users_col.find_one({"_id": oid})
+    user = await users_col.find_one({"_id": oid}, USER_PROJECTION)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user["_id"] = str(user["_id"])
-    return user
+    return MongoJSONResponse(user)
 
 
-@app.put("/users/{user_id}")
+@router.put("/users/{user_id}")
 async def update_user(user_id: str, payload: RegisterRequest):
     try:
         oid = PyObjectId.validate(user_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid user id")
     doc = payload.dict()
-    await users_col.update_one({"_id": oid}, {"$set": doc})
+    doc["features"] = compute_user_features(doc)
+    # The unique email index rejects an email another account already uses
+    try:
+        await users_col.update_one({"_id": oid}, {"$set": doc})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    # Only this worker's cache; other workers serve their cached ranking until
+    # RECOMMEND_CACHE_TTL_SECONDS expires
+    recommend_cache.invalidate_tag(str(oid))
+    # Precomputed recommendations reflect the old profile
+    await recommendations_col.delete_one({"_id": oid})
     return {"status": "ok"}
 
 
-@app.post("/internships")
+@router.post("/internships")
 async def create_internship(item: InternshipIn):
     doc = item.dict()
     res = await internships_col.insert_one(doc)
+    await catalog.add([doc])
+    recommend_cache.clear()
     return {"internship_id": str(res.inserted_id)}
 
 
-@app.get("/internships")
-async def list_internships():
-    items = await internships_col.find().to_list(length=None)
-    for it in items:
-        it["_id"] = str(it["_id"])
-    return items
+INTERNSHIP_PAGE_MAX = 200
+
+# Names accepted in GET /internships?fields=
+INTERNSHIP_FIELDS = {"_id", *InternshipIn.model_fields}
+
+
+@router.get("/internships", response_class=MongoJSONResponse)
+async def list_internships(
+    after: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=INTERNSHIP_PAGE_MAX),
+    location: Optional[str] = None,
+    workLocation: Optional[str] = None,
+    jobType: Optional[str] = None,
+    industry: Optional[str] = None,
+    experienceLevel: Optional[str] = None,
+    companySize: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    One page of internships in _id order. Pass the returned `next_after` as
+    `after` to fetch the next page; `fields` is a comma-separated projection
+    of InternshipIn fields and _id. A single filter is served by its (field,
+    _id) index; further filters are applied to the documents that index scan
+    returns.
+    """
+    filters = {
+        "location": location,
+        "workLocation": workLocation,
+        "jobType": jobType,
+        "industry": industry,
+        "experienceLevel": experienceLevel,
+        "companySize": companySize,
+    }
+    query = {field: value for field, value in filters.items() if value is not None}
+    if after:
+        try:
+            query["_id"] = {"$gt": PyObjectId.validate(after)}
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid after id")
+    projection = None
+    if fields:
+        names = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [name for name in names if name not in INTERNSHIP_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        projection = {name: 1 for name in names}
+
+    cursor = internships_browse_col.find(query, projection).sort("_id", ASCENDING).limit(limit)
+    items = await cursor.to_list(length=limit)
+    next_after = str(items[-1]["_id"]) if len(items) == limit else None
+    return MongoJSONResponse({"items": items, "next_after": next_after})
+
+
+# Documents per cursor batch and per streamed chunk in /export endpoints
+EXPORT_BATCH_SIZE = 1000
+
+
+async def ndjson_rows(collection, projection=None):
+    """Yield a collection as NDJSON, one chunk per cursor batch."""
+    lines = []
+    async for doc in collection.find({}, projection).batch_size(EXPORT_BATCH_SIZE):
+        lines.append(dumps(doc))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
 
+@router.get("/export/internships.ndjson")
+async def export_internships():
+    return StreamingResponse(ndjson_rows(internships_col), media_type="application/x-ndjson")
 
-@app.get("/internships/{intern_id}")
+
+@router.get("/export/users.ndjson")
+async def export_users():
+    return StreamingResponse(ndjson_rows(users_col, USER_PROJECTION), media_type="application/x-ndjson")
+
+
+@router.get("/internships/{intern_id}", response_class=MongoJSONResponse)
 async def get_internship(intern_id: str):
     try:
         oid = PyObjectId.validate(intern_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid internship id")
-    it = await internships_col.find_one({"_id": oid})
+    it = await internships_browse_col.find_one({"_id": oid})
     if not it:
         raise HTTPException(status_code=404, detail="Not found")
-    it["_id"] = str(it["_id"])
-    return it
+    return MongoJSONResponse(it)
+
 
+# MongoDB's write error code for a unique index violation
+DUPLICATE_KEY_ERROR = 11000
 
-@app.post("/apply")
+
+@router.post("/apply")
 async def apply(user_id: str = Body(...), internship_id: str = Body(...)):
     try:
         uoid = PyObjectId.validate(user_id)
@@ -253,158 +576,337 @@ async def apply(user_id: str = Body(...), internship_id: str = Body(...)):
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid ids")
     application = {"user_id": uoid, "internship_id": ioid, "status": "applied"}
-    res = await applications_col.insert_one(application)
+    # Applying twice returns the existing application
+    try:
+        res = await applications_col.insert_one(application)
+    except DuplicateKeyError:
+        existing = await applications_col.find_one({"user_id": uoid, "internship_id": ioid}, {"_id": 1})
+        return {"application_id": str(existing["_id"])}
     return {"application_id": str(res.inserted_id)}
 
 
-@app.post("/seed_internships")
+@router.post("/apply/bulk")
+async def apply_bulk(payload: BulkApplyRequest):
+    """
+    Apply one user to many internships with a single unordered insert_many.
+    Unknown internship ids are skipped and returned in `missing`; internships
+    the user already applied to return their existing application id.
+    """
+    try:
+        uoid = PyObjectId.validate(payload.user_id)
+        ioids = list(dict.fromkeys(PyObjectId.validate(i) for i in payload.internship_ids))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    if not await users_col.find_one({"_id": uoid}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="User not found")
+    found = {
+        doc["_id"]
+        async for doc in internships_col.find({"_id": {"$in": ioids}}, {"_id": 1})
+    }
+    missing = [str(ioid) for ioid in ioids if ioid not in found]
+    applications = [
+        {"user_id": uoid, "internship_id": ioid, "status": "applied"}
+        for ioid in ioids if ioid in found
+    ]
+    if not applications:
+        return {"application_ids": [], "missing": missing}
+    # insert_many sets each document's _id
+    try:
+        await applications_col.insert_many(applications, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: every document without an error was still inserted. The
+        # unique index rejects the ones the user already applied to
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != DUPLICATE_KEY_ERROR for err in errors):
+            raise
+        failed = [applications[err["index"]] for err in errors]
+        existing = {
+            doc["internship_id"]: doc["_id"]
+            async for doc in applications_col.find(
+                {"user_id": uoid, "internship_id": {"$in": [doc["internship_id"] for doc in failed]}},
+                {"internship_id": 1},
+            )
+        }
+        for doc in failed:
+            doc["_id"] = existing[doc["internship_id"]]
+    return {"application_ids": [str(doc["_id"]) for doc in applications], "missing": missing}
+
+
+# Internship fields joined into GET /users/{id}/applications
+APPLICATION_INTERNSHIP_FIELDS = (
+    "title", "company", "location", "jobType", "workLocation", "applicationDeadline"
+)
+
+
+@router.get("/users/{user_id}/applications", response_class=MongoJSONResponse)
+async def list_user_applications(user_id: str):
+    """A user's applications, each joined to a summary of its internship."""
+    try:
+        oid = PyObjectId.validate(user_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid user id")
+    # One aggregation instead of a lookup per application; the $lookup
+    # sub-pipeline (MongoDB 5.0+) projects the summary inside the join
+    pipeline = [
+        {"$match": {"user_id": oid}},
+        {"$lookup": {
+            "from": internships_col.name,
+            "localField": "internship_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {field: 1 for field in APPLICATION_INTERNSHIP_FIELDS}}],
+            "as": "internship",
+        }},
+        {"$unwind": {"path": "$internship", "preserveNullAndEmptyArrays": True}},
+        {"$sort": {"_id": 1}},
+    ]
+    applications = await applications_col.aggregate(pipeline).to_list(length=None)
+    return MongoJSONResponse({"applications": applications})
+
+
+@router.post("/seed_internships")
 async def seed_internships(items: List[dict]):
     # Accept raw dicts and insert; useful for quick seeding from frontend or scripts
     if not items:
         return {"inserted": 0}
     res = await internships_col.insert_many(items)
+    await catalog.add(items)
+    recommend_cache.clear()
     return {"inserted": len(res.inserted_ids)}
 
 
-@app.get("/recommendations")
-async def recommend(user_id: str, top_n: int = 10):
+# Rows per insert_many in /seed_internships/ndjson, and row errors listed per chunk
+INGEST_CHUNK_SIZE = 1000
+INGEST_MAX_ERRORS_PER_CHUNK = 100
+
+
+def validation_message(error):
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+async def insert_chunk(number, docs, line_numbers, errors):
+    """
+    Insert one chunk of validated rows unordered and summarize it. `errors`
+    holds the chunk's validation errors; write errors are added to it.
+    """
+    invalid = len(errors)
+    inserted = 0
+    if docs:
+        try:
+            res = await internships_col.insert_many(docs, ordered=False)
+            inserted = len(res.inserted_ids)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            for err in e.details.get("writeErrors", []):
+                errors.append({"line": line_numbers[err["index"]], "error": err.get("errmsg")})
+    return {
+        "chunk": number,
+        "inserted": inserted,
+        "rejected": invalid + len(docs) - inserted,
+        "errors": errors[:INGEST_MAX_ERRORS_PER_CHUNK],
+    }
+
+
+@router.post("/seed_internships/ndjson")
+async def ingest_internships(request: Request):
+    """
+    Streamed bulk load: the body is NDJSON, one internship object per line.
+    Rows are validated against InternshipIn and inserted INGEST_CHUNK_SIZE at
+    a time, so memory stays flat regardless of the feed size. Invalid rows are
+    rejected with their line number and the rest of the feed still loads.
+    """
+    chunks = []
+    docs, line_numbers, errors = [], [], []
+    line_number = 0
+    buffer = b""
+
+    async def flush():
+        nonlocal docs, line_numbers, errors
+        chunks.append(await insert_chunk(len(chunks) + 1, docs, line_numbers, errors))
+        docs, line_numbers, errors = [], [], []
+
+    def add_row(line):
+        try:
+            row = orjson.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("row must be a JSON object")
+            docs.append(InternshipIn(**row).dict())
+            line_numbers.append(line_number)
+        except ValidationError as e:
+            errors.append({"line": line_number, "error": validation_message(e)})
+        except ValueError as e:
+            errors.append({"line": line_number, "error": str(e)})
+
+    try:
+        async for data in request.stream():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    add_row(line)
+                    if len(docs) + len(errors) >= INGEST_CHUNK_SIZE:
+                        await flush()
+        if buffer.strip():
+            line_number += 1
+            add_row(buffer)
+        if docs or errors:
+            await flush()
+    finally:
+        # Reload the catalog once on the next read rather than extending it
+        # per chunk; also covers chunks written before a failure
+        catalog.invalidate()
+        recommend_cache.clear()
+
+    return {
+        "inserted": sum(chunk["inserted"] for chunk in chunks),
+        "rejected": sum(chunk["rejected"] for chunk in chunks),
+        "chunks": chunks,
+    }
+
+
+@router.get("/recommendations", response_class=MongoJSONResponse)
+async def recommend(user_id: str, top_n: int = 10, mode: str = RECOMMEND_MODE):
+    if mode not in RECOMMEND_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(RECOMMEND_MODES)}")
     try:
         oid = PyObjectId.validate(user_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid user id")
-    user = await users_col.find_one({"_id": oid})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Keyed on the catalog fingerprint rather than the process-local version,
+    # so internships written by other processes (picked up by a reload) also
+    # retire cached rankings
+    view = await catalog.get()
+    key = (str(oid), top_n, mode, view.fingerprint)
+    cached = recommend_cache.get(key)
+    if cached is not None:
+        return MongoJSONResponse(cached)
+
+    result = await materialized_recommendations(oid, view, top_n)
+    if result is None:
+        user = await users_col.find_one({"_id": oid})
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        result = await rank_recommendations(view, user, top_n, mode)
+    recommend_cache.set(key, result, tag=str(oid))
+    return MongoJSONResponse(result)
+
 
-    internships = await internships_col.find().to_list(length=None)
+async def materialized_recommendations(oid, view, top_n):
+    """
+    The user's precomputed recommendations, or None when there is no entry or
+    it is stale: computed against another catalog version, older than
+    MATERIALIZED_MAX_AGE_SECONDS, or holding fewer than top_n results.
+    Materialized entries are exact, so they are served for every mode.
+    """
+    if MATERIALIZED_MAX_AGE_SECONDS <= 0:
+        return None
+    entry = await recommendations_col.find_one({"_id": oid})
+    if entry is None:
+        materialized_stats["missing"] += 1
+        return None
+    age = datetime.now(timezone.utc) - entry["computed_at"].replace(tzinfo=timezone.utc)
+    if (
+        entry.get("catalog_version") != view.fingerprint
+        or age.total_seconds() > MATERIALIZED_MAX_AGE_SECONDS
+        or top_n > entry["top_k"]
+    ):
+        materialized_stats["stale"] += 1
+        return None
+    materialized_stats["served"] += 1
+    return {"recommendations": entry["recommendations"][:top_n]}
+
+
+async def rank_recommendations(view, user, top_n, mode):
+    internships = view.items
     if not internships:
         return {"recommendations": []}
+    engine = await view.load_engine()
+
+    # In "ann" mode only the LSH candidates are scored, in "skills" mode only
+    # internships sharing a skill with the user (plus the fallback pool). If
+    # the candidates cannot fill top_n we score the whole catalog instead.
+    rows = None
+    if mode == "ann":
+        rows = (await view.load_ann_index()).candidates(engine, user)
+    elif mode == "skills":
+        rows = (await view.load_skill_index()).candidates(engine, user)
+    if rows is not None and len(rows) < top_n:
+        rows = None
+
+    stats = recommend_stats[mode]
+    stats["requests"] += 1
+    stats["scored"] += len(internships) if rows is None else len(rows)
+    stats["catalog"] += len(internships)
+
+    # Large catalogs scored exactly are split into row shards scored by the
+    # worker processes, which return only their shard's top_n
+    if rows is None and parallel_scorer.enabled_for(len(internships)):
+        winners, scores = await parallel_scorer.top_n_async(view.shared, engine.query(user), top_n)
+        return {
+            "recommendations": [
+                recommendation_item(internships[i], score) for i, score in zip(winners, scores)
+            ]
+        }
+
+    # Enhanced recommendation algorithm, internships are scored in one
+    # vectorized pass (same weights as calculate_match_score). Only the top_n
+    # winners are turned into response dicts.
+    scores = engine.score(user, rows)
+    winners = top_n_indices(scores, top_n)
+    return {
+        "recommendations": [
+            recommendation_item(internships[i if rows is None else rows[i]], scores[i])
+            for i in winners
+        ]
+    }
 
-    # Enhanced recommendation algorithm
-    recommendations = []
-    
-    for internship in internships:
-        score = calculate_match_score(user, internship)
-        recommendations.append({
-            "internship_id": str(internship["_id"]),
-            "title": internship.get("title"),
-            "company": internship.get("company"),
-            "description": internship.get("description"),
-            "location": internship.get("location"),
-            "jobType": internship.get("jobType"),
-            "duration": internship.get("duration"),
-            "salary": internship.get("salary"),
-            "skills": internship.get("skills", []),
-            "experienceLevel": internship.get("experienceLevel"),
-            "workLocation": internship.get("workLocation"),
-            "companySize": internship.get("companySize"),
-            "industry": internship.get("industry"),
-            "requirements": internship.get("requirements", []),
-            "benefits": internship.get("benefits", []),
-            "applicationDeadline": internship.get("applicationDeadline"),
-            "startDate": internship.get("startDate"),
-            "match": round(score * 100, 1)  # Convert to percentage
-        })
-    
-    # Sort by match score and return top_n
-    recommendations.sort(key=lambda x: x["match"], reverse=True)
-    return {"recommendations": recommendations[:top_n]}
 
-def calculate_match_score(user, internship):
-    """
-    Enhanced matching algorithm that considers multiple factors:
-    1. Skills match (40%)
-    2. Experience level match (20%)
-    3. Location preferences (15%)
-    4. Company size preferences (10%)
-    5. Job type preferences (10%)
-    6. Industry preferences (5%)
-    """
-    total_score = 0.0
-    
-    # 1. Skills Match (40%)
-    user_skills = set([skill.lower() for skill in user.get("technicalSkills", [])])
-    internship_skills = set([skill.lower() for skill in internship.get("skills", [])])
-    
-    if user_skills and internship_skills:
-        skills_match = len(user_skills.intersection(internship_skills)) / len(internship_skills)
-        total_score += skills_match * 0.4
-    
-    # 2. Experience Level Match (20%)
-    user_exp = user.get("experienceLevel", "")
-    internship_exp = internship.get("experienceLevel", "")
-    
-    exp_scores = {
-        ("entry", "entry"): 1.0,
-        ("entry", "mid"): 0.7,
-        ("mid", "mid"): 1.0,
-        ("mid", "senior"): 0.8,
-        ("senior", "senior"): 1.0,
-        ("senior", "lead"): 0.9,
-        ("lead", "lead"): 1.0,
+def rank_batch_chunk(engine, internships, users, top_n):
+    """Top-N recommendation items of each user in `users`, by user id."""
+    scores = engine.score_many(users)
+    return {
+        str(user["_id"]): [recommendation_item(internships[i], row[i]) for i in top_n_indices(row, top_n)]
+        for user, row in zip(users, scores)
     }
-    
-    exp_score = exp_scores.get((user_exp, internship_exp), 0.5)
-    total_score += exp_score * 0.2
-    
-    # 3. Location Preferences (15%)
-    user_location_pref = user.get("workLocation", "")
-    internship_location = internship.get("workLocation", "")
-    user_remote_ok = user.get("remoteWork", False)
-    user_relocate_ok = user.get("willingToRelocate", False)
-    
-    if user_location_pref == internship_location:
-        location_score = 1.0
-    elif internship_location == "remote" and user_remote_ok:
-        location_score = 0.9
-    elif user_relocate_ok:
-        location_score = 0.7
-    else:
-        location_score = 0.3
-    
-    total_score += location_score * 0.15
-    
-    # 4. Company Size Preferences (10%)
-    user_company_size = user.get("companySize", "")
-    internship_company_size = internship.get("companySize", "")
-    
-    if user_company_size == internship_company_size:
-        company_score = 1.0
-    elif not user_company_size:  # No preference
-        company_score = 0.8
-    else:
-        company_score = 0.5
-    
-    total_score += company_score * 0.1
-    
-    # 5. Job Type Preferences (10%)
-    user_job_type = user.get("jobType", "")
-    internship_job_type = internship.get("jobType", "")
-    
-    if user_job_type == internship_job_type:
-        job_type_score = 1.0
-    elif not user_job_type:  # No preference
-        job_type_score = 0.8
-    else:
-        job_type_score = 0.5
-    
-    total_score += job_type_score * 0.1
-    
-    # 6. Industry Preferences (5%)
-    user_industries = set([ind.lower() for ind in user.get("industryPreferences", [])])
-    internship_industry = internship.get("industry", "").lower()
-    
-    if internship_industry in user_industries:
-        industry_score = 1.0
-    elif not user_industries:  # No preference
-        industry_score = 0.8
-    else:
-        industry_score = 0.5
-    
-    total_score += industry_score * 0.05
-    
-    return min(total_score, 1.0)  # Cap at 1.0
+
+
+@router.post("/recommendations/batch", response_class=MongoJSONResponse)
+async def recommend_batch(payload: BatchRecommendationRequest):
+    try:
+        oids = [PyObjectId.validate(user_id) for user_id in payload.user_ids]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid user id")
+    users = await users_col.find({"_id": {"$in": oids}}).to_list(length=None)
+    found = {str(user["_id"]) for user in users}
+    missing = [user_id for user_id in payload.user_ids if user_id not in found]
+
+    view = await catalog.get()
+    internships = view.items
+    engine = await view.load_engine()
+    chunk_size = max(1, BATCH_SCORING_BUDGET // max(engine.size, 1))
+    loop = asyncio.get_running_loop()
+    results = {}
+    for start in range(0, len(users), chunk_size):
+        # Scored in a worker thread so the event loop keeps serving requests
+        results.update(await loop.run_in_executor(
+            None, rank_batch_chunk, engine, internships, users[start:start + chunk_size], payload.top_n
+        ))
+    return MongoJSONResponse({"recommendations": results, "missing": missing})
+
+
+def __getattr__(name):
+    # `uvicorn main:app` builds the app on first access; `uvicorn --factory
+    # main:create_app` calls the factory itself, so only one app is built
+    # and its startup_timings are not overwritten
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000)
\ No newline at end of file
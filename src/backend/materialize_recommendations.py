@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Precompute recommendations for every user
+
+Scores all users against the current internship catalog in batches sized
+so a batch's score matrix stays within BATCH_SCORING_BUDGET elements and
+writes each user's top-K into the `recommendations` collection, keyed by
+user _id, with the time it was computed and the catalog_fingerprint() it was
+computed against. /recommendations serves these entries with a single _id
+lookup while they are fresh and falls back to live scoring otherwise. Run it
+periodically (e.g. from cron) after the catalog or many profiles change.
+
+Usage:
+    python materialize_recommendations.py [--top-k 50] [--batch-size 256]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import motor.motor_asyncio
+from pymongo import ReplaceOne
+
+from catalog import CatalogView
+from config import BATCH_SCORING_BUDGET, MATERIALIZED_TOP_K, MONGODB_URI, TEXT_MATCH_WEIGHT
+from recommender import recommendation_item, top_n_indices
+
+client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+db = client.aiintern
+users_col = db.users
+internships_col = db.internships
+recommendations_col = db.recommendations
+
+
+def materialized_entry(user, internships, scores, top_k, computed_at, catalog_version):
+    return {
+        "_id": user["_id"],
+        "top_k": top_k,
+        "recommendations": [
+            recommendation_item(internships[i], scores[i]) for i in top_n_indices(scores, top_k)
+        ],
+        "computed_at": computed_at,
+        "catalog_version": catalog_version,
+    }
+
+
+async def write_batch(view, users, top_k, computed_at):
+    scores = view.engine.score_many(users)
+    ops = [
+        ReplaceOne(
+            {"_id": user["_id"]},
+            materialized_entry(user, view.items, row, top_k, computed_at, view.fingerprint),
+            upsert=True,
+        )
+        for user, row in zip(users, scores)
+    ]
+    await recommendations_col.bulk_write(ops, ordered=False)
+
+
+async def materialize(top_k, batch_size):
+    start = time.perf_counter()
+    # Entries are stamped with the time the catalog was read, not written
+    computed_at = datetime.now(timezone.utc)
+    # _id order like the server's catalog, so tied scores rank the same
+    items = await internships_col.find().sort("_id", 1).to_list(length=None)
+    view = CatalogView(items, 0, text_weight=TEXT_MATCH_WEIGHT)
+    print(f"📚 Loaded {len(items)} internships (catalog version {view.fingerprint})")
+    # Each batch's dense score matrix is users x catalog
+    batch_size = max(1, min(batch_size, BATCH_SCORING_BUDGET // max(len(items), 1)))
+
+    written = 0
+    batch = []
+    async for user in users_col.find().batch_size(batch_size):
+        batch.append(user)
+        if len(batch) >= batch_size:
+            await write_batch(view, batch, top_k, computed_at)
+            written += len(batch)
+            batch = []
+            print(f"   ... {written} users")
+    if batch:
+        await write_batch(view, batch, top_k, computed_at)
+        written += len(batch)
+    print(f"✅ Materialized top {top_k} recommendations for {written} users "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Precompute recommendations for every user")
+    parser.add_argument("--top-k", type=int, default=MATERIALIZED_TOP_K)
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="users per batch at most; large catalogs use fewer (BATCH_SCORING_BUDGET)")
+    args = parser.parse_args()
+    try:
+        await materialize(args.top_k, args.batch_size)
+    except Exception as e:
+        print(f"❌ Materialization failed: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,246 @@
+"""
+In-process stand-in for the Motor collections used by main.py
+
+Used by benchmark_suite.py to time the endpoint handlers without a MongoDB
+server. Supports the subset of the Motor API the handlers use: find() with
+projection / sort / limit / batch_size, find_one (with sort), insert_one,
+insert_many, update_one, delete_one, count_documents,
+estimated_document_count and create_indexes (unique indexes,
+also compound ones, are enforced). Filters support equality and $in, $ne, $gt, $gte, $lt, $lte
+on top-level fields. Documents are kept in _id order, so _id range scans and
+_id-sorted pages start at a bisected position like an index scan.
+"""
+
+import bisect
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+OPERATORS = {
+    "$in": lambda value, arg: value in arg,
+    "$ne": lambda value, arg: value != arg,
+    "$gt": lambda value, arg: value is not None and value > arg,
+    "$gte": lambda value, arg: value is not None and value >= arg,
+    "$lt": lambda value, arg: value is not None and value < arg,
+    "$lte": lambda value, arg: value is not None and value <= arg,
+}
+
+
+def matches(doc, query):
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            for op, arg in condition.items():
+                if op not in OPERATORS:
+                    raise NotImplementedError(f"memory_db does not support {op}")
+                if not OPERATORS[op](value, arg):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def project(doc, projection):
+    if not projection:
+        return dict(doc)
+    include = [field for field, flag in projection.items() if flag and field != "_id"]
+    if include or projection.get("_id"):
+        out = {field: doc[field] for field in include if field in doc}
+        if projection.get("_id", 1):
+            out["_id"] = doc["_id"]
+        return out
+    return {field: value for field, value in doc.items() if projection.get(field, 1)}
+
+
+class Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class MemoryCursor:
+    def __init__(self, collection, query, projection):
+        self.collection = collection
+        self.query = dict(query or {})
+        self.projection = projection
+        self._sort = None
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        self._sort = (key, direction)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    def _ids(self):
+        ids = self.collection._ids
+        id_filter = self.query.get("_id")
+        lo, hi = 0, len(ids)
+        if isinstance(id_filter, dict):
+            if "$gt" in id_filter:
+                lo = bisect.bisect_right(ids, id_filter["$gt"])
+            elif "$gte" in id_filter:
+                lo = bisect.bisect_left(ids, id_filter["$gte"])
+            if "$lt" in id_filter:
+                hi = bisect.bisect_left(ids, id_filter["$lt"])
+            elif "$lte" in id_filter:
+                hi = bisect.bisect_right(ids, id_filter["$lte"])
+            if "$in" in id_filter:
+                docs = self.collection._docs
+                return sorted(i for i in set(id_filter["$in"]) if i in docs)
+        elif id_filter is not None:
+            return [id_filter] if id_filter in self.collection._docs else []
+        positions = range(lo, hi)
+        if self._sort == ("_id", -1):
+            positions = reversed(positions)
+        return (ids[k] for k in positions)
+
+    def _results(self):
+        docs = self.collection._docs
+        out = []
+        if self._sort is None or self._sort[0] == "_id":
+            for _id in self._ids():
+                doc = docs[_id]
+                if matches(doc, self.query):
+                    out.append(project(doc, self.projection))
+                    if self._limit and len(out) >= self._limit:
+                        break
+            return out
+        key, direction = self._sort
+        found = [doc for doc in (docs[_id] for _id in self._ids()) if matches(doc, self.query)]
+        found.sort(key=lambda doc: doc.get(key), reverse=direction == -1)
+        if self._limit:
+            found = found[:self._limit]
+        return [project(doc, self.projection) for doc in found]
+
+    async def to_list(self, length=None):
+        results = self._results()
+        return results if length is None else results[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._results():
+            yield doc
+
+
+def unique_key(doc, fields):
+    return tuple(doc.get(field) for field in fields)
+
+
+class MemoryCollection:
+    def __init__(self, name):
+        self.name = name
+        self._docs = {}  # _id -> document
+        self._ids = []  # sorted _ids
+        self._unique = {}  # key fields -> {values: _id}
+
+    async def create_indexes(self, indexes):
+        for index in indexes:
+            spec = index.document
+            if spec.get("unique"):
+                fields = tuple(spec["key"])
+                self._unique[fields] = {unique_key(doc, fields): _id for _id, doc in self._docs.items()}
+        return [index.document["name"] for index in indexes]
+
+    def _insert(self, doc):
+        doc.setdefault("_id", ObjectId())
+        _id = doc["_id"]
+        if _id in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_")
+        for fields, values in self._unique.items():
+            if unique_key(doc, fields) in values:
+                raise self._duplicate(fields)
+        for fields, values in self._unique.items():
+            values[unique_key(doc, fields)] = _id
+        self._docs[_id] = dict(doc)
+        if not self._ids or _id > self._ids[-1]:
+            self._ids.append(_id)
+        else:
+            bisect.insort(self._ids, _id)
+        return _id
+
+    async def insert_one(self, doc):
+        return Result(inserted_id=self._insert(doc), acknowledged=True)
+
+    async def insert_many(self, docs, ordered=True):
+        inserted, errors = [], []
+        for index, doc in enumerate(docs):
+            try:
+                inserted.append(self._insert(doc))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted)})
+        return Result(inserted_ids=inserted, acknowledged=True)
+
+    def find(self, query=None, projection=None):
+        return MemoryCursor(self, query, projection)
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        cursor = MemoryCursor(self, query, projection).limit(1)
+        if sort:
+            cursor.sort(*sort[0])
+        results = await cursor.to_list()
+        return results[0] if results else None
+
+    async def count_documents(self, query):
+        return len(await MemoryCursor(self, query, None).to_list())
+
+    async def estimated_document_count(self):
+        return len(self._docs)
+
+    async def update_one(self, query, update, upsert=False):
+        found = await MemoryCursor(self, query, {"_id": 1}).limit(1).to_list()
+        if not found:
+            return Result(matched_count=0, modified_count=0)
+        doc = self._docs[found[0]["_id"]]
+        changes = update.get("$set", {})
+        updated = {**doc, **changes}
+        for fields, values in self._unique.items():
+            old, new = unique_key(doc, fields), unique_key(updated, fields)
+            if new != old and new in values:
+                raise self._duplicate(fields)
+        for fields, values in self._unique.items():
+            values.pop(unique_key(doc, fields), None)
+            values[unique_key(updated, fields)] = doc["_id"]
+        doc.update(changes)
+        return Result(matched_count=1, modified_count=1)
+
+    async def delete_one(self, query):
+        found = await MemoryCursor(self, query, {"_id": 1}).limit(1).to_list()
+        if not found:
+            return Result(deleted_count=0)
+        doc = self._docs.pop(found[0]["_id"])
+        self._ids.pop(bisect.bisect_left(self._ids, doc["_id"]))
+        for fields, values in self._unique.items():
+            values.pop(unique_key(doc, fields), None)
+        return Result(deleted_count=1)
+
+    def _duplicate(self, fields):
+        index = "_".join(f"{field}_1" for field in fields)
+        return DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {index}")
+
+
+class MemoryDatabase:
+    """Collections by attribute or item access, created on first use."""
+
+    def __init__(self):
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
@@ -0,0 +1,145 @@
+"""
+Per-route HTTP metrics in the Prometheus text exposition format
+
+MetricsMiddleware is a plain ASGI middleware (no per-request Request
+objects or extra tasks): it times each HTTP request and records it under the
+matched route template, e.g. /users/{user_id}, so ids in paths do not create
+new series. HTTPMetrics keeps request counters by (method, route, status)
+and a latency histogram by (method, route); render() produces the text
+served at /metrics.
+
+While a request is handled, `current_request` holds its RequestStats so code
+further down (the MongoDB command listener in db_monitoring.py) can
+attribute work to the route and add to the request's totals.
+"""
+
+import bisect
+import time
+from contextvars import ContextVar
+
+# Latency histogram bucket upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Per-request accumulator for work done on behalf of one HTTP request."""
+
+    __slots__ = ("scope", "db_commands", "db_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.db_commands = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self):
+        # Set by the router once the request has been matched
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+current_request = ContextVar("current_request", default=None)
+
+
+def format_labels(**labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class HTTPMetrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.requests = {}  # (method, route, status) -> count
+        self.histograms = {}  # (method, route) -> [bucket counts..., +Inf count, sum]
+        self.db = {}  # (method, route) -> [MongoDB commands, MongoDB seconds]
+        self.in_progress = 0
+
+    def observe(self, method, route, status, seconds, db_commands=0, db_seconds=0.0):
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.histograms.get((method, route))
+        if histogram is None:
+            histogram = self.histograms[(method, route)] = [0] * (len(self.buckets) + 1) + [0.0]
+        # Per-bucket counts; made cumulative only when rendering
+        histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+        if db_commands:
+            totals = self.db.setdefault((method, route), [0, 0.0])
+            totals[0] += db_commands
+            totals[1] += db_seconds
+
+    def render(self):
+        lines = [
+            "# HELP http_requests_total HTTP requests by method, route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{{{format_labels(method=method, route=route, status=status)}}} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency by method and route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.histograms.items()):
+            labels = format_labels(method=method, route=route)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram[-1]:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        lines += [
+            "# HELP http_request_db_commands_total MongoDB commands issued while handling requests.",
+            "# TYPE http_request_db_commands_total counter",
+        ]
+        for (method, route), (commands, _) in sorted(self.db.items()):
+            lines.append(f"http_request_db_commands_total{{{format_labels(method=method, route=route)}}} {commands}")
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent in MongoDB commands while handling requests.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route), (_, db_seconds) in sorted(self.db.items()):
+            lines.append(f"http_request_db_seconds_total{{{format_labels(method=method, route=route)}}} {db_seconds:.6f}")
+
+        lines += [
+            "# HELP http_requests_in_progress HTTP requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.in_progress}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # if the app raises before starting a response
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        metrics.in_progress += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_progress -= 1
+            current_request.reset(token)
+            metrics.observe(
+                scope["method"], stats.route, status, time.perf_counter() - start,
+                stats.db_commands, stats.db_seconds,
+            )
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Backfill the derived matching features stored on user documents
+
+register and update_user store compute_user_features() alongside each
+profile. This one-off migration computes them for users written before
+that (or with an outdated USER_FEATURES_VERSION) using batched bulk writes.
+
+Usage:
+    python migrate_user_features.py [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+import motor.motor_asyncio
+from pymongo import UpdateOne
+
+from config import MONGODB_URI
+from recommender import USER_FEATURES_VERSION, compute_user_features
+
+client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+db = client.aiintern
+users_col = db.users
+
+# Profile fields compute_user_features() reads
+SOURCE_FIELDS = [
+    "technicalSkills", "industryPreferences", "experienceLevel", "workLocation",
+    "remoteWork", "willingToRelocate", "companySize", "jobType",
+    "bio", "currentJobTitle", "jobPreferences",
+]
+
+
+async def migrate(batch_size):
+    query = {"features.version": {"$ne": USER_FEATURES_VERSION}}
+    total = await users_col.count_documents(query)
+    print(f"🔎 {total} users need matching features")
+
+    updated = 0
+    batch = []
+    cursor = users_col.find(query, {field: 1 for field in SOURCE_FIELDS}).batch_size(batch_size)
+    async for user in cursor:
+        batch.append(UpdateOne({"_id": user["_id"]}, {"$set": {"features": compute_user_features(user)}}))
+        if len(batch) >= batch_size:
+            result = await users_col.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+            batch = []
+            print(f"   ... {updated}/{total}")
+    if batch:
+        result = await users_col.bulk_write(batch, ordered=False)
+        updated += result.modified_count
+    print(f"✅ Updated features on {updated} users")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill user matching features")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    try:
+        await migrate(args.batch_size)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
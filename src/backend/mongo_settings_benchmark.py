@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Throughput of the internship read path under different MongoDB client settings
+
+Runs the queries behind GET /internships (a 50-document page in _id order)
+and GET /internships/{id} (find_one by _id) from --concurrency concurrent
+tasks against a real deployment, once per client variant: pool sizes,
+wire compression and read preference. Each variant gets a fresh Motor client
+built from config.MONGO_CLIENT_OPTIONS plus its own overrides, and reports
+the latency of the first round of requests (connection setup, which
+minPoolSize pre-pays), throughput and p50/p99 latency.
+
+Needs internships in the database (see seed_database.py or synthetic_data.py).
+Compressors whose library is not installed and secondary read preferences
+on a standalone server are still run; pymongo then falls back to no
+compression / the primary, which the results will show as no change.
+
+Usage:
+    python mongo_settings_benchmark.py --duration 10 --concurrency 50
+    python mongo_settings_benchmark.py --variants default pool_10 zstd secondary_preferred
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+import motor.motor_asyncio
+from pymongo import ASCENDING
+
+from config import DATABASE_NAME, MONGO_CLIENT_OPTIONS, MONGODB_URI
+
+PAGE_SIZE = 50
+
+# Variant name -> MongoClient options applied on top of the configured ones
+VARIANTS = {
+    "default": {},
+    "pool_10": {"maxPoolSize": 10},
+    "pool_50": {"maxPoolSize": 50},
+    "pool_200": {"maxPoolSize": 200},
+    "min_pool_20": {"minPoolSize": 20},
+    "zlib": {"compressors": "zlib"},
+    "zstd": {"compressors": "zstd"},
+    "snappy": {"compressors": "snappy"},
+    "secondary_preferred": {"readPreference": "secondaryPreferred"},
+    "nearest": {"readPreference": "nearest"},
+}
+
+
+def percentile(ordered, p):
+    # Nearest-rank percentile of an already sorted list
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+async def read_page(collection, ids, rng):
+    # GET /internships: the first page or one after a random cursor
+    query = {"_id": {"$gt": rng.choice(ids)}} if rng.random() < 0.5 else {}
+    await collection.find(query).sort("_id", ASCENDING).limit(PAGE_SIZE).to_list(length=PAGE_SIZE)
+
+
+async def read_one(collection, ids, rng):
+    # GET /internships/{id}
+    await collection.find_one({"_id": rng.choice(ids)})
+
+
+async def run_variant(uri, options, ids, args):
+    client = motor.motor_asyncio.AsyncIOMotorClient(uri, **options)
+    collection = client[DATABASE_NAME].internships
+    rng = random.Random(args.seed)
+    operations = (read_page, read_one)
+
+    async def timed(operation):
+        start = time.perf_counter()
+        await operation(collection, ids, rng)
+        return (time.perf_counter() - start) * 1000
+
+    try:
+        await client.admin.command("ping")
+        if options.get("minPoolSize"):
+            # Give the background pool filler the time a server has between
+            # startup and its first request
+            await asyncio.sleep(args.pool_fill_wait)
+        first_round = await asyncio.gather(
+            *(timed(operations[i % 2]) for i in range(args.concurrency))
+        )
+
+        latencies = []
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                operation = read_page if rng.random() < args.page_share else read_one
+                latencies.append(await timed(operation))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+
+    ordered = sorted(latencies)
+    return {
+        "first_round_ms": round(max(first_round), 2),
+        "ops": len(ordered),
+        "throughput_ops": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+    }
+
+
+async def run(args):
+    sample = motor.motor_asyncio.AsyncIOMotorClient(args.uri, **MONGO_CLIENT_OPTIONS)
+    try:
+        ids = [
+            doc["_id"]
+            async for doc in sample[DATABASE_NAME].internships.find({}, {"_id": 1}).limit(args.sample_ids)
+        ]
+    finally:
+        sample.close()
+    if not ids:
+        raise SystemExit(f"❌ No internships in {DATABASE_NAME}; seed the database first")
+
+    print(f"📦 {len(ids)} sampled internship ids, {args.concurrency} concurrent tasks, "
+          f"{args.duration}s per variant, configured options {MONGO_CLIENT_OPTIONS}")
+    results = {}
+    for name in args.variants:
+        options = {**MONGO_CLIENT_OPTIONS, **VARIANTS[name]}
+        results[name] = await run_variant(args.uri, options, ids, args)
+        row = results[name]
+        print(f"   {name:<20} {row['throughput_ops']:>9.1f} ops/s   p50 {row['p50_ms']:>7.2f} ms   "
+              f"p99 {row['p99_ms']:>7.2f} ms   first round {row['first_round_ms']:>7.2f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--uri", default=MONGODB_URI)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per variant")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--page-share", type=float, default=0.5, help="share of page reads vs single-document reads")
+    parser.add_argument("--sample-ids", type=int, default=1000)
+    parser.add_argument("--pool-fill-wait", type=float, default=1.0, help="seconds to let minPoolSize connect")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Multi-core sharded scoring over shared-memory catalog arrays
+
+SharedCatalog copies the arrays ScoringEngine scores from (skill matrix CSR
+arrays, skill counts, categorical codes and the TF-IDF CSR arrays) into
+multiprocessing.shared_memory blocks, once per catalog view. ParallelScorer
+runs a process pool whose workers attach to those blocks by name without
+copying, score one row shard each with score_arrays() and return their
+local top-N; the parent merges the shard winners.
+
+When the catalog comes from a CatalogStore its arrays are already files on
+disk: MappedCatalog describes them by path and the workers memory-map the
+same files, so no process holds a private copy.
+"""
+
+import asyncio
+import multiprocessing
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from catalog_store import array_path
+from recommender import score_arrays, top_n_indices
+
+
+class SharedCatalog:
+    """Engine arrays in shared memory, described by a picklable `spec`."""
+
+    def __init__(self, engine):
+        arrays = engine.arrays()
+        text_matrix = engine.text_matrix
+
+        self.size = engine.size
+        self._blocks = []
+        self.spec = {
+            "key": uuid.uuid4().hex,
+            "fields": list(engine.codes),
+            "skill_columns": len(engine.skill_ids),
+            "text_columns": None if text_matrix is None else text_matrix.shape[1],
+            "text_weight": engine.text_weight,
+            "arrays": {},
+        }
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec["arrays"][name] = (block.name, array.dtype.str, array.shape)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+class MappedCatalog:
+    """The arrays of a CatalogStore version, described by path for the workers."""
+
+    def __init__(self, engine, version_path):
+        self.size = engine.size
+        text_matrix = engine.text_matrix
+        self.spec = {
+            "key": version_path,
+            "path": version_path,
+            "fields": list(engine.codes),
+            "skill_columns": len(engine.skill_ids),
+            "text_columns": None if text_matrix is None else text_matrix.shape[1],
+            "text_weight": engine.text_weight,
+            "arrays": list(engine.arrays()),
+        }
+
+
+def share(view_or_owner, engine):
+    """SharedCatalog of `engine`, unlinked once `view_or_owner` is garbage collected."""
+    shared = SharedCatalog(engine)
+    weakref.finalize(view_or_owner, shared.close)
+    return shared
+
+
+# Worker side: blocks of the most recently used catalog, keyed by spec key
+_attached = {}
+
+
+def _worker_arrays(spec):
+    entry = _attached.get(spec["key"])
+    if entry is None:
+        for blocks, _ in _attached.values():
+            for block in blocks:
+                block.close()
+        _attached.clear()
+        blocks, arrays = [], {}
+        if "path" in spec:
+            # MappedCatalog: the CatalogStore files, shared through the page cache
+            for name in spec["arrays"]:
+                arrays[name] = np.load(array_path(spec["path"], name), mmap_mode="r")
+        else:
+            for name, (block_name, dtype, shape) in spec["arrays"].items():
+                # Spawned workers share the parent's resource tracker, so the
+                # parent's unlink() also clears this attachment's registration
+                block = shared_memory.SharedMemory(name=block_name)
+                blocks.append(block)
+                arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        entry = _attached[spec["key"]] = (blocks, arrays)
+    return entry[1]
+
+
+def _csr_rows(arrays, prefix, start, stop, columns):
+    indptr = arrays[prefix + "_indptr"]
+    lo, hi = indptr[start], indptr[stop]
+    return sparse.csr_matrix(
+        (arrays[prefix + "_data"][lo:hi], arrays[prefix + "_indices"][lo:hi], indptr[start:stop + 1] - lo),
+        shape=(stop - start, columns),
+    )
+
+
+def score_shard(spec, start, stop, query, top_n):
+    """Top-N (rows, scores) of catalog rows [start, stop) for one UserQuery."""
+    arrays = _worker_arrays(spec)
+    skill_matrix = _csr_rows(arrays, "skill", start, stop, spec["skill_columns"])
+    codes = {field: arrays["codes:" + field][start:stop] for field in spec["fields"]}
+    text_matrix = None
+    if spec["text_columns"] is not None:
+        text_matrix = _csr_rows(arrays, "text", start, stop, spec["text_columns"])
+    scores = score_arrays(
+        skill_matrix, arrays["skill_counts"][start:stop], codes, text_matrix, query, spec["text_weight"]
+    )
+    best = top_n_indices(scores, top_n)
+    return best + start, scores[best]
+
+
+def merge_top_n(parts, top_n):
+    """Merge per-shard (rows, scores) winners; ties keep catalog order."""
+    rows = np.concatenate([p[0] for p in parts])
+    scores = np.concatenate([p[1] for p in parts])
+    order = np.argsort(rows, kind="stable")
+    rows, scores = rows[order], scores[order]
+    best = top_n_indices(scores, top_n)
+    return rows[best], scores[best]
+
+
+class ParallelScorer:
+    """
+    Process pool scoring shared catalogs in `workers` shards. Used only for
+    catalogs of at least `min_catalog` internships, below that the pickling
+    and scheduling overhead outweighs the extra cores.
+    """
+
+    def __init__(self, workers, min_catalog):
+        self.workers = workers
+        self.min_catalog = min_catalog
+        self._pool = None
+
+    def enabled_for(self, size):
+        return self.workers > 1 and size >= self.min_catalog
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            # spawn: forking a process that runs an event loop and Motor's
+            # threads is not safe
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _shards(self, size):
+        bounds = np.linspace(0, size, self.workers + 1).astype(int)
+        return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    def top_n(self, shared, query, top_n):
+        futures = [
+            self.pool.submit(score_shard, shared.spec, start, stop, query, top_n)
+            for start, stop in self._shards(shared.size)
+        ]
+        return merge_top_n([f.result() for f in futures], top_n)
+
+    async def top_n_async(self, shared, query, top_n):
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, score_shard, shared.spec, start, stop, query, top_n)
+            for start, stop in self._shards(shared.size)
+        ])
+        return merge_top_n(parts, top_n)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Latency report for sharded multi-process recommendation scoring
+
+Builds a synthetic catalog, copies it into shared memory and compares the
+single-process exact top-N against ParallelScorer with several worker
+counts, checking that both return the same internships and scores.
+
+Usage:
+    python parallel_benchmark.py --sizes 200000 1000000 --workers 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ann_benchmark import synthetic_internships, synthetic_users
+from parallel import ParallelScorer, SharedCatalog
+from recommender import ScoringEngine, top_n_indices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200000, 1000000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, os.cpu_count() or 1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--text-weight", type=float, default=0.0)
+    args = parser.parse_args()
+
+    users = synthetic_users(args.users)
+    print(f"cpus available: {os.cpu_count()}")
+    print(f"{'catalog':>9} {'workers':>7} {'ms/user':>8} {'speedup':>8}")
+    for size in args.sizes:
+        engine = ScoringEngine(synthetic_internships(size), text_weight=args.text_weight)
+        queries = [engine.query(user) for user in users]
+
+        start = time.perf_counter()
+        expected = []
+        for user in users:
+            scores = engine.score(user)
+            best = top_n_indices(scores, args.top_n)
+            expected.append((best, scores[best]))
+        serial_ms = (time.perf_counter() - start) * 1000 / len(users)
+        print(f"{size:>9} {1:>7} {serial_ms:>8.2f} {1:>8.2f}")
+
+        shared = SharedCatalog(engine)
+        try:
+            for workers in args.workers:
+                scorer = ParallelScorer(workers, min_catalog=0)
+                # Start the workers and attach them to the catalog before timing
+                scorer.top_n(shared, queries[0], args.top_n)
+                start = time.perf_counter()
+                results = [scorer.top_n(shared, query, args.top_n) for query in queries]
+                parallel_ms = (time.perf_counter() - start) * 1000 / len(users)
+                scorer.shutdown()
+                for (rows, scores), (best, best_scores) in zip(results, expected):
+                    assert np.array_equal(rows, best) and np.array_equal(scores, best_scores)
+                print(f"{size:>9} {workers:>7} {parallel_ms:>8.2f} {serial_ms / parallel_ms:>8.2f}")
+        finally:
+            shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+"""
+Recommendation scoring for the AI Internship Platform
+
+calculate_match_score() scores a single (user, internship) pair and is the
+reference implementation of the matching weights. ScoringEngine holds the
+internship catalog as arrays so a user can be scored against every
+internship with a few NumPy operations instead of a Python loop.
+"""
+
+import copy
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+
+# Matching factor weights (must add up to 1.0)
+SKILLS_WEIGHT = 0.4
+EXPERIENCE_WEIGHT = 0.2
+LOCATION_WEIGHT = 0.15
+COMPANY_SIZE_WEIGHT = 0.1
+JOB_TYPE_WEIGHT = 0.1
+INDUSTRY_WEIGHT = 0.05
+
+EXPERIENCE_SCORES = {
+    ("entry", "entry"): 1.0,
+    ("entry", "mid"): 0.7,
+    ("mid", "mid"): 1.0,
+    ("mid", "senior"): 0.8,
+    ("senior", "senior"): 1.0,
+    ("senior", "lead"): 0.9,
+    ("lead", "lead"): 1.0,
+}
+
+
+def experience_score(user_exp, internship_exp):
+    return EXPERIENCE_SCORES.get((user_exp, internship_exp), 0.5)
+
+
+def location_score(user_location_pref, user_remote_ok, user_relocate_ok, internship_location):
+    if user_location_pref == internship_location:
+        return 1.0
+    elif internship_location == "remote" and user_remote_ok:
+        return 0.9
+    elif user_relocate_ok:
+        return 0.7
+    return 0.3
+
+
+def preference_score(user_pref, internship_value):
+    """Used for both company size and job type preferences."""
+    if user_pref == internship_value:
+        return 1.0
+    elif not user_pref:  # No preference
+        return 0.8
+    return 0.5
+
+
+def industry_score(user_industries, internship_industry):
+    if internship_industry in user_industries:
+        return 1.0
+    elif not user_industries:  # No preference
+        return 0.8
+    return 0.5
+
+
+def internship_text(internship):
+    parts = [internship.get("title"), internship.get("description")]
+    parts.extend(internship.get("requirements") or [])
+    return " ".join(p for p in parts if p)
+
+
+def user_text(user):
+    parts = [user.get("bio"), user.get("currentJobTitle")]
+    parts.extend(user.get("jobPreferences") or [])
+    parts.extend(user.get("technicalSkills") or [])
+    return " ".join(p for p in parts if p)
+
+
+# Bump when compute_user_features() changes so migrate_user_features.py
+# recomputes the stored features
+USER_FEATURES_VERSION = 1
+
+
+def compute_user_features(user):
+    """
+    Normalized matching features of a user profile. They are stored on the
+    user document at write time (register / update_user) so the scoring path
+    never re-derives them; migrate_user_features.py backfills existing users.
+    """
+    return {
+        "version": USER_FEATURES_VERSION,
+        "skills": sorted(set([skill.lower() for skill in user.get("technicalSkills") or []])),
+        "industries": sorted(set([ind.lower() for ind in user.get("industryPreferences") or []])),
+        "experienceLevel": user.get("experienceLevel", ""),
+        "workLocation": user.get("workLocation", ""),
+        "remoteWork": user.get("remoteWork", False),
+        "willingToRelocate": user.get("willingToRelocate", False),
+        "companySize": user.get("companySize", ""),
+        "jobType": user.get("jobType", ""),
+        "text": user_text(user),
+    }
+
+
+def user_features(user):
+    """Stored features of `user` if current, otherwise computed on the fly."""
+    features = user.get("features")
+    if features and features.get("version") == USER_FEATURES_VERSION:
+        return features
+    return compute_user_features(user)
+
+
+def calculate_match_score(user, internship):
+    """
+    Enhanced matching algorithm that considers multiple factors:
+    1. Skills match (40%)
+    2. Experience level match (20%)
+    3. Location preferences (15%)
+    4. Company size preferences (10%)
+    5. Job type preferences (10%)
+    6. Industry preferences (5%)
+    """
+    total_score = 0.0
+    features = user_features(user)
+
+    # 1. Skills Match (40%)
+    user_skills = features["skills"]
+    internship_skills = set([skill.lower() for skill in internship.get("skills", [])])
+
+    if user_skills and internship_skills:
+        skills_match = len(internship_skills.intersection(user_skills)) / len(internship_skills)
+        total_score += skills_match * SKILLS_WEIGHT
+
+    # 2. Experience Level Match (20%)
+    exp = experience_score(features["experienceLevel"], internship.get("experienceLevel", ""))
+    total_score += exp * EXPERIENCE_WEIGHT
+
+    # 3. Location Preferences (15%)
+    loc = location_score(
+        features["workLocation"],
+        features["remoteWork"],
+        features["willingToRelocate"],
+        internship.get("workLocation", ""),
+    )
+    total_score += loc * LOCATION_WEIGHT
+
+    # 4. Company Size Preferences (10%)
+    company = preference_score(features["companySize"], internship.get("companySize", ""))
+    total_score += company * COMPANY_SIZE_WEIGHT
+
+    # 5. Job Type Preferences (10%)
+    job_type = preference_score(features["jobType"], internship.get("jobType", ""))
+    total_score += job_type * JOB_TYPE_WEIGHT
+
+    # 6. Industry Preferences (5%)
+    industry = industry_score(features["industries"], internship.get("industry", "").lower())
+    total_score += industry * INDUSTRY_WEIGHT
+
+    return min(total_score, 1.0)  # Cap at 1.0
+
+
+def top_n_indices(scores, n):
+    """
+    Indices of the `n` highest scores, best first. Ties are broken by catalog
+    order so results are deterministic. Runs in O(len(scores) + n log n).
+    """
+    n = min(max(n, 0), len(scores))
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    if n < len(scores):
+        threshold = np.partition(scores, len(scores) - n)[len(scores) - n]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[: n - len(above)]
+        candidates = np.concatenate((above, ties))
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def recommendation_item(internship, score):
+    """Response dict of one recommended internship, `score` in [0, 1]."""
+    return {
+        "internship_id": str(internship["_id"]),
+        "title": internship.get("title"),
+        "company": internship.get("company"),
+        "description": internship.get("description"),
+        "location": internship.get("location"),
+        "jobType": internship.get("jobType"),
+        "duration": internship.get("duration"),
+        "salary": internship.get("salary"),
+        "skills": internship.get("skills", []),
+        "experienceLevel": internship.get("experienceLevel"),
+        "workLocation": internship.get("workLocation"),
+        "companySize": internship.get("companySize"),
+        "industry": internship.get("industry"),
+        "requirements": internship.get("requirements", []),
+        "benefits": internship.get("benefits", []),
+        "applicationDeadline": internship.get("applicationDeadline"),
+        "startDate": internship.get("startDate"),
+        "match": round(float(score) * 100, 1)  # Convert to percentage
+    }
+
+
+class TextIndex:
+    """
+    Sparse TF-IDF matrix of internship text (title, description, requirements).
+
+    The vectorizer is fitted once; extended() transforms new internships with
+    the existing vocabulary instead of refitting. Rows are L2-normalised, so a
+    user's similarity to every internship is one sparse matrix-vector product.
+    """
+
+    def __init__(self, internships):
+        # scikit-learn (with scipy.stats and pandas) takes seconds to import,
+        # so it is loaded when the first catalog is indexed, not at startup
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.size = len(internships)
+        self.vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        try:
+            self.matrix = self.vectorizer.fit_transform([internship_text(it) for it in internships])
+        except ValueError:
+            # Empty vocabulary (no catalog text yet)
+            self.vectorizer, self.matrix = None, None
+
+    @classmethod
+    def from_parts(cls, vectorizer, matrix, size):
+        """A TextIndex over an already fitted vectorizer and its matrix."""
+        index = cls.__new__(cls)
+        index.size, index.vectorizer, index.matrix = size, vectorizer, matrix
+        return index
+
+    def extended(self, internships):
+        index = copy.copy(self)
+        index.size += len(internships)
+        if self.vectorizer is not None:
+            rows = self.vectorizer.transform([internship_text(it) for it in internships])
+            index.matrix = sparse.vstack([self.matrix, rows]).tocsr()
+        return index
+
+    def similarity_many(self, texts):
+        """Return a (len(texts), size) matrix of cosine similarities."""
+        if self.vectorizer is None:
+            return np.zeros((len(texts), self.size), dtype=np.float64)
+        queries = self.vectorizer.transform(texts)
+        return (queries @ self.matrix.T).toarray()
+
+
+# Per-user inputs of score_arrays(): skill matrix columns of the user's
+# skills, weighted per-value tables of the categorical factors and the TF-IDF
+# query row (None without text matching)
+UserQuery = namedtuple("UserQuery", ["columns", "tables", "text"])
+
+
+def score_arrays(skill_matrix, skill_counts, codes, text_matrix, query, text_weight=0.0):
+    """
+    Scores of the internships described by the given arrays for one UserQuery.
+    This is the whole per-internship computation: ScoringEngine and the
+    parallel shard workers (parallel.py) both call it, so their results are
+    identical.
+    """
+    scores = np.zeros(len(skill_counts), dtype=np.float64)
+    if len(scores) == 0:
+        return scores
+
+    # 1. Skills: matched skill count / internship skill count
+    if query.columns:
+        user_vec = np.zeros(skill_matrix.shape[1], dtype=np.float64)
+        user_vec[query.columns] = 1.0
+        matched = skill_matrix @ user_vec
+        np.divide(matched, skill_counts, out=scores, where=skill_counts > 0)
+        scores *= SKILLS_WEIGHT
+
+    # 2-6. Categorical factors via per-user lookup tables
+    for field, table in query.tables.items():
+        scores += table[codes[field]]
+
+    np.minimum(scores, 1.0, out=scores)
+    if text_weight:
+        scores *= 1.0 - text_weight
+        if text_matrix is not None and query.text is not None:
+            scores += text_weight * (text_matrix @ query.text.T).toarray().ravel()
+    return scores
+
+
+class ScoringEngine:
+    """
+    Array form of the internship catalog.
+
+    Skills are stored as a sparse internship x skill membership matrix and the
+    categorical fields as integer codes into a per-field vocabulary. Scoring a
+    user builds one small lookup table per field (one entry per distinct
+    value), so the per-internship work is a sparse mat-vec plus a few gathers.
+    With text_weight=0 scores are bit-for-bit identical to
+    calculate_match_score(); otherwise the six-factor score is blended with
+    TF-IDF text similarity as (1 - text_weight) * score + text_weight * text.
+    """
+
+    CATEGORICAL_FIELDS = ("experienceLevel", "workLocation", "companySize", "jobType", "industry")
+
+    def __init__(self, internships, text_weight=0.0):
+        self.size = 0
+        self.skill_ids = {}
+        self.skill_matrix = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self.skill_counts = np.zeros(0, dtype=np.float64)
+        self.values = {field: [] for field in self.CATEGORICAL_FIELDS}
+        self.codes = {field: np.zeros(0, dtype=np.int32) for field in self.CATEGORICAL_FIELDS}
+        self._vocabs = {field: {} for field in self.CATEGORICAL_FIELDS}
+        self.text_weight = text_weight
+        self.text_index = TextIndex(internships) if text_weight else None
+        self._append(internships)
+
+    def arrays(self):
+        """
+        The engine's NumPy arrays by name: skill matrix CSR arrays, skill
+        counts, categorical codes ("codes:<field>") and the TF-IDF CSR arrays.
+        Everything else the engine holds (vocabularies, the fitted vectorizer)
+        is in state().
+        """
+        arrays = {
+            "skill_data": self.skill_matrix.data,
+            "skill_indices": self.skill_matrix.indices,
+            "skill_indptr": self.skill_matrix.indptr,
+            "skill_counts": self.skill_counts,
+        }
+        for field, codes in self.codes.items():
+            arrays["codes:" + field] = codes
+        if self.text_matrix is not None:
+            arrays["text_data"] = self.text_matrix.data
+            arrays["text_indices"] = self.text_matrix.indices
+            arrays["text_indptr"] = self.text_matrix.indptr
+        return arrays
+
+    def state(self):
+        """The picklable non-array part of the engine, see from_arrays()."""
+        text_index = self.text_index
+        return {
+            "size": self.size,
+            "skill_ids": self.skill_ids,
+            "values": self.values,
+            "text_weight": self.text_weight,
+            "text_index": text_index is not None,
+            "vectorizer": None if text_index is None else text_index.vectorizer,
+            "text_columns": None if self.text_matrix is None else self.text_matrix.shape[1],
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, state):
+        """
+        Rebuild an engine from arrays() and state() without copying the
+        arrays, so it can score straight from memory-mapped files.
+        """
+        engine = cls.__new__(cls)
+        engine.size = state["size"]
+        engine.skill_ids = state["skill_ids"]
+        engine.values = state["values"]
+        engine._vocabs = {
+            field: {value: code for code, value in enumerate(values)}
+            for field, values in engine.values.items()
+        }
+        engine.skill_matrix = sparse.csr_matrix(
+            (arrays["skill_data"], arrays["skill_indices"], arrays["skill_indptr"]),
+            shape=(engine.size, len(engine.skill_ids)),
+        )
+        engine.skill_counts = arrays["skill_counts"]
+        engine.codes = {field: arrays["codes:" + field] for field in cls.CATEGORICAL_FIELDS}
+        engine.text_weight = state["text_weight"]
+        engine.text_index = None
+        if state["text_index"]:
+            matrix = None
+            if state["text_columns"] is not None:
+                matrix = sparse.csr_matrix(
+                    (arrays["text_data"], arrays["text_indices"], arrays["text_indptr"]),
+                    shape=(engine.size, state["text_columns"]),
+                )
+            engine.text_index = TextIndex.from_parts(state["vectorizer"], matrix, engine.size)
+        return engine
+
+    def extended(self, internships):
+        """
+        Return a new engine with `internships` appended to this one. Vocabularies
+        and the fitted TF-IDF model are reused, nothing is rebuilt from scratch.
+        """
+        engine = copy.copy(self)
+        engine.skill_ids = dict(self.skill_ids)
+        engine.values = {field: list(values) for field, values in self.values.items()}
+        engine._vocabs = {field: dict(vocab) for field, vocab in self._vocabs.items()}
+        # _encode() replaces the per-field arrays; the old engine keeps its own
+        engine.codes = dict(self.codes)
+        if self.text_index is not None:
+            engine.text_index = self.text_index.extended(internships)
+        engine._append(internships)
+        return engine
+
+    def _append(self, internships):
+        rows, cols = [], []
+        skill_counts = np.zeros(len(internships), dtype=np.float64)
+        for i, internship in enumerate(internships):
+            skills = set([skill.lower() for skill in internship.get("skills", [])])
+            for skill in skills:
+                rows.append(i)
+                cols.append(self.skill_ids.setdefault(skill, len(self.skill_ids)))
+            skill_counts[i] = len(skills)
+
+        # New skills add columns, which leaves the existing CSR rows unchanged
+        old = self.skill_matrix
+        old = sparse.csr_matrix((old.data, old.indices, old.indptr), shape=(self.size, len(self.skill_ids)))
+        new = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(internships), len(self.skill_ids)),
+        )
+        self.skill_matrix = sparse.vstack([old, new]).tocsr()
+        self.skill_counts = np.concatenate([self.skill_counts, skill_counts])
+
+        # Integer-coded categorical fields, industry is matched case-insensitively
+        for field in ("experienceLevel", "workLocation", "companySize", "jobType"):
+            self._encode(field, [it.get(field, "") for it in internships])
+        self._encode("industry", [it.get("industry", "").lower() for it in internships])
+        self.size += len(internships)
+
+    def _encode(self, field, column):
+        vocab = self._vocabs[field]
+        codes = np.fromiter(
+            (vocab.setdefault(value, len(vocab)) for value in column),
+            dtype=np.int32,
+            count=len(column),
+        )
+        self.values[field] = list(vocab)
+        self.codes[field] = np.concatenate([self.codes[field], codes])
+
+    def skill_columns(self, user):
+        """Skill matrix columns of the user's technical skills."""
+        return [self.skill_ids[s] for s in user_features(user)["skills"] if s in self.skill_ids]
+
+    def field_tables(self, user):
+        """Weighted per-value score tables of the five categorical factors."""
+        features = user_features(user)
+        user_exp = features["experienceLevel"]
+        user_location = features["workLocation"]
+        remote_ok = features["remoteWork"]
+        relocate_ok = features["willingToRelocate"]
+        user_company_size = features["companySize"]
+        user_job_type = features["jobType"]
+        user_industries = features["industries"]
+
+        factors = (
+            ("experienceLevel", lambda v: experience_score(user_exp, v), EXPERIENCE_WEIGHT),
+            ("workLocation", lambda v: location_score(user_location, remote_ok, relocate_ok, v), LOCATION_WEIGHT),
+            ("companySize", lambda v: preference_score(user_company_size, v), COMPANY_SIZE_WEIGHT),
+            ("jobType", lambda v: preference_score(user_job_type, v), JOB_TYPE_WEIGHT),
+            ("industry", lambda v: industry_score(user_industries, v), INDUSTRY_WEIGHT),
+        )
+        return {
+            field: np.array([factor(value) for value in self.values[field]], dtype=np.float64) * weight
+            for field, factor, weight in factors
+        }
+
+    @property
+    def text_matrix(self):
+        if self.text_index is None:
+            return None
+        return self.text_index.matrix
+
+    def query(self, user):
+        """The UserQuery of `user` against this catalog."""
+        text = None
+        if self.text_matrix is not None:
+            text = self.text_index.vectorizer.transform([user_features(user)["text"]])
+        return UserQuery(self.skill_columns(user), self.field_tables(user), text)
+
+    def score(self, user, rows=None):
+        """
+        Return an array with the match score of every internship for `user`.
+        If `rows` (an index array) is given only those internships are scored,
+        in that order.
+        """
+        skill_matrix, skill_counts, codes, text_matrix = (
+            self.skill_matrix, self.skill_counts, self.codes, self.text_matrix
+        )
+        if rows is not None:
+            skill_matrix, skill_counts = skill_matrix[rows], skill_counts[rows]
+            codes = {field: field_codes[rows] for field, field_codes in codes.items()}
+            if text_matrix is not None:
+                text_matrix = text_matrix[rows]
+        return score_arrays(skill_matrix, skill_counts, codes, text_matrix, self.query(user), self.text_weight)
+
+    def score_many(self, users):
+        """
+        Return a (len(users), size) score matrix. Skills for all users are
+        matched with one sparse matrix product. With text_weight=0 row i equals
+        score(users[i]) exactly; with text blended in, the batched TF-IDF
+        product can differ from score() in the last bits.
+        """
+        scores = np.zeros((len(users), self.size), dtype=np.float64)
+        if not users or self.size == 0:
+            return scores
+
+        rows, cols = [], []
+        for i, user in enumerate(users):
+            columns = self.skill_columns(user)
+            rows.extend([i] * len(columns))
+            cols.extend(columns)
+        user_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(users), len(self.skill_ids)),
+        )
+        matched = (user_matrix @ self.skill_matrix.T).toarray()
+        np.divide(matched, self.skill_counts, out=scores, where=self.skill_counts > 0)
+        scores *= SKILLS_WEIGHT
+
+        user_tables = [self.field_tables(user) for user in users]
+        for field, codes in self.codes.items():
+            tables = np.stack([t[field] for t in user_tables])
+            scores += tables[:, codes]
+
+        np.minimum(scores, 1.0, out=scores)
+        if self.text_index is not None:
+            texts = [user_features(user)["text"] for user in users]
+            scores = self._blend_text(scores, self.text_index.similarity_many(texts))
+        return scores
+
+    def _blend_text(self, scores, similarity):
+        scores *= 1.0 - self.text_weight
+        scores += self.text_weight * similarity
+        return scores
@@ -0,0 +1,41 @@
+"""
+Fast JSON responses for MongoDB documents
+
+FastAPI serializes a returned dict by walking it with jsonable_encoder and
+then calling json.dumps, which copies every document twice and cannot handle
+ObjectId. Endpoints that return Mongo documents instead return a
+MongoJSONResponse: orjson serializes the documents in one pass, handling
+datetime natively and ObjectId / Decimal128 through bson_default().
+"""
+
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi.responses import Response
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+def bson_default(value):
+    """
+    orjson `default` hook for the BSON types stored in our documents. Other
+    types raise TypeError, so an unexpected value fails loudly instead of
+    being sent as its repr.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        # The exact decimal string; a float could lose precision
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content):
+    """Serialize a document (or list of documents) to JSON bytes."""
+    return orjson.dumps(content, default=bson_default, option=ORJSON_OPTIONS)
+
+
+class MongoJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
@@ -13,6 +13,7 @@ import random
 
 # MongoDB connection
 from config import MONGODB_URI
+from recommender import compute_user_features
 client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
 db = client.aiintern
 
@@ -239,6 +240,7 @@ async def seed_test_user():
         "updatedAt": datetime.now().isoformat()
     }
     
+    test_user["features"] = compute_user_features(test_user)
     result = await users_col.insert_one(test_user)
     print(f"✅ Created test user with ID: {result.inserted_id}")
     return result.inserted_id
@@ -0,0 +1,42 @@
+"""
+Inverted skill index for recommendation candidate generation
+
+Maps every normalized (lowercased) skill to the posting list of catalog rows
+that list it. Skills carry 40% of the match score, so in "skills" mode
+/recommendations scores only internships sharing at least one skill with
+the user, plus a fallback pool of the newest listings so fresh internships
+and users without matching skills still get results.
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+class SkillIndex:
+    def __init__(self, engine, fallback=200):
+        self.size = engine.size
+        self.fallback = fallback
+        # Column j of the CSC matrix is the posting list of skill id j
+        self.postings = engine.skill_matrix.tocsc()
+
+    def extended(self, engine):
+        """
+        Return an index over `engine`, which must extend the engine this index
+        was built for. Only the new rows are added to the posting lists.
+        """
+        index = SkillIndex.__new__(SkillIndex)
+        index.size = engine.size
+        index.fallback = self.fallback
+        old = self.postings
+        extra = len(engine.skill_ids) - old.shape[1]
+        indptr = np.concatenate([old.indptr, np.full(extra, old.indptr[-1])])
+        old = sparse.csc_matrix((old.data, old.indices, indptr), shape=(self.size, len(engine.skill_ids)))
+        index.postings = sparse.vstack([old, engine.skill_matrix[self.size:]], format="csc")
+        return index
+
+    def candidates(self, engine, user):
+        """Sorted rows sharing a skill with `user`, plus the fallback pool."""
+        indptr, indices = self.postings.indptr, self.postings.indices
+        parts = [indices[indptr[c]:indptr[c + 1]] for c in engine.skill_columns(user)]
+        parts.append(np.arange(max(self.size - self.fallback, 0), self.size))
+        return np.unique(np.concatenate(parts))
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic users, internships and applications at scale
+
+Generates production-sized data for local load tests and benchmarks:
+users in the RegisterRequest shape (with the stored matching features, as
+/register writes them), internships in the InternshipIn shape and
+applications linking them. Records are generated in blocks of BLOCK_SIZE,
+each from its own seeded RNG, and ObjectIds are derived from (kind, seed,
+index), so the output for a given seed is identical however many workers
+produce it and applications reference users and internships without
+reading them back.
+
+Blocks are generated by a pool of worker processes; each inserts its block
+into MongoDB with unordered insert_many batches and/or writes it to
+<out>/<kind>/part-NNNNN.ndjson for offline benchmarks (read it back with
+read_records()).
+
+Usage:
+    python synthetic_data.py --users 1000000 --internships 200000 --mongo --workers 8
+    python synthetic_data.py --users 100000 --internships 20000 --out data/ --seed 7
+"""
+
+import argparse
+import glob
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import orjson
+from bson import ObjectId
+
+from recommender import compute_user_features
+from responses import dumps
+
+BLOCK_SIZE = 10000
+
+# ObjectId timestamps count up from 2024-01-01, one second per 1000 records,
+# so _id order is generation order
+BASE_TIMESTAMP = 1704067200
+KIND_CODES = {"users": 1, "internships": 2, "applications": 3}
+
+# Applications of one user get ids user_index * MAX_APPLICATIONS_PER_USER + j
+MAX_APPLICATIONS_PER_USER = 50
+
+# Role families: title, skill pool and the industries hiring for it. Skills
+# and users are drawn mostly from one family so matching has structure.
+ROLES = [
+    ("Software Engineering Intern", ["python", "java", "javascript", "git", "sql", "distributed systems", "c++", "linux", "api development"], ["Technology", "Fintech", "Transportation"]),
+    ("Frontend Development Intern", ["javascript", "typescript", "react", "html", "css", "redux", "webpack", "figma"], ["Technology", "Travel", "Entertainment"]),
+    ("Backend Engineering Intern", ["python", "java", "sql", "microservices", "kafka", "docker", "api development", "distributed systems"], ["Technology", "Fintech", "Cloud Computing"]),
+    ("Data Science Intern", ["python", "sql", "pandas", "numpy", "statistics", "data analysis", "data visualization", "machine learning"], ["Technology", "Fintech", "Entertainment"]),
+    ("Machine Learning Engineering Intern", ["python", "tensorflow", "pytorch", "machine learning", "deep learning", "nlp", "computer vision", "mathematics"], ["AI/Research", "Technology"]),
+    ("Data Engineering Intern", ["python", "sql", "spark", "etl", "data pipelines", "kafka", "aws"], ["Technology", "Cloud Computing", "Fintech"]),
+    ("DevOps Engineering Intern", ["docker", "kubernetes", "terraform", "ci/cd", "linux", "aws", "automation", "devops"], ["Cloud Computing", "Technology"]),
+    ("Cloud Solutions Intern", ["aws", "azure", "cloud computing", "networking", "linux", "terraform"], ["Cloud Computing"]),
+    ("Mobile App Development Intern", ["swift", "kotlin", "ios", "android", "react native", "mobile development", "api integration"], ["Technology", "Travel", "Transportation"]),
+    ("Cybersecurity Intern", ["security", "cybersecurity", "networking", "penetration testing", "malware analysis", "linux", "python"], ["Cybersecurity"]),
+    ("Game Development Intern", ["c++", "c#", "unity", "unreal engine", "game design", "game development", "3d graphics"], ["Gaming", "Entertainment"]),
+    ("UX/UI Design Intern", ["figma", "ui design", "ux design", "user research", "prototyping", "design systems", "adobe creative suite"], ["Design", "Technology"]),
+    ("Product Management Intern", ["product management", "agile", "strategy", "communication", "data analysis", "user research"], ["Technology", "Fintech", "Travel"]),
+    ("Blockchain Developer Intern", ["solidity", "ethereum", "smart contracts", "web3", "defi", "blockchain", "javascript"], ["Fintech"]),
+]
+SOFT_SKILLS = ["communication", "teamwork", "problem solving", "leadership", "time management", "adaptability", "creativity"]
+LANGUAGES = ["English", "Spanish", "Mandarin", "Hindi", "French", "German", "Portuguese", "Japanese"]
+
+COMPANIES = [
+    "Google", "Meta", "Microsoft", "AWS", "Netflix", "Stripe", "Airbnb", "Uber", "Figma", "Slack",
+    "Coinbase", "CrowdStrike", "Docker", "Epic Games", "OpenAI", "Datadog", "Shopify", "Atlassian",
+]
+CITIES = [
+    "San Francisco, CA", "Seattle, WA", "Austin, TX", "New York, NY", "Boston, MA", "Mountain View, CA",
+    "Menlo Park, CA", "Los Gatos, CA", "Cary, NC", "Chicago, IL", "Denver, CO", "Atlanta, GA",
+]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Priya", "Wei", "Maria", "Omar", "Aisha", "Lucas", "Emma", "Noah", "Yuki", "Ravi", "Sofia", "Daniel"]
+LAST_NAMES = ["Smith", "Patel", "Kim", "Garcia", "Nguyen", "Johnson", "Chen", "Williams", "Singh", "Brown", "Lopez", "Müller", "Ito", "Okafor"]
+UNIVERSITIES = ["Stanford University", "MIT", "UC Berkeley", "University of Washington", "Georgia Tech", "UT Austin", "Carnegie Mellon University", "University of Michigan"]
+DEGREE_FIELDS = ["Computer Science", "Data Science", "Electrical Engineering", "Mathematics", "Design", "Information Systems"]
+BENEFITS = ["Mentorship program", "Health insurance", "Free meals", "Learning budget", "Flexible hours", "Remote work setup", "Team events", "Stock options", "Transportation", "Conference attendance"]
+REQUIREMENTS = ["Currently pursuing a relevant degree", "Strong problem-solving skills", "Experience with {skill}", "Familiarity with {skill}", "Good communication skills"]
+DURATIONS = ["12 weeks", "16 weeks", "20 weeks", "24 weeks"]
+
+# Categorical values as submitted by the profile form, with rough frequencies
+EXPERIENCE_LEVELS = (["entry", "mid", "senior", "lead"], [70, 20, 8, 2])
+WORK_LOCATIONS = (["remote", "hybrid", "onsite", "flexible"], [30, 40, 25, 5])
+COMPANY_SIZES = (["startup", "small", "medium", "large", "enterprise"], [25, 20, 20, 25, 10])
+JOB_TYPES = (["internship", "full-time", "part-time", "contract", "freelance"], [60, 15, 15, 7, 3])
+APPLICATION_STATUSES = (["applied", "reviewing", "interview", "rejected", "offer"], [70, 15, 8, 5, 2])
+
+
+def object_id(kind, seed, index):
+    """Deterministic ObjectId of record `index` of `kind` for `seed`."""
+    return ObjectId(struct.pack(
+        ">IBHxI", BASE_TIMESTAMP + index // 1000, KIND_CODES[kind], seed & 0xFFFF, index
+    ))
+
+
+def block_rng(kind, seed, block):
+    return random.Random(f"{kind}:{seed}:{block}")
+
+
+def block_range(block, total):
+    return range(block * BLOCK_SIZE, min((block + 1) * BLOCK_SIZE, total))
+
+
+def weighted(rng, choices):
+    values, weights = choices
+    return rng.choices(values, weights)[0]
+
+
+def role_skills(rng, role, low, high):
+    # Mostly from the role's pool, sometimes a skill from another family
+    _, pool, _ = role
+    skills = set(rng.sample(pool, min(rng.randint(low, high), len(pool))))
+    if rng.random() < 0.3:
+        skills.add(rng.choice(rng.choice(ROLES)[1]))
+    return sorted(skills)
+
+
+def internship_block(seed, block, total):
+    rng = block_rng("internships", seed, block)
+    docs = []
+    for i in block_range(block, total):
+        role = rng.choice(ROLES)
+        title, _, industries = role
+        skills = role_skills(rng, role, 3, 7)
+        company = rng.choice(COMPANIES)
+        start = date(2025, 1, 6) + timedelta(weeks=rng.randint(0, 52))
+        docs.append({
+            "_id": object_id("internships", seed, i),
+            "title": title,
+            "company": company,
+            "description": (
+                f"Join {company} as a {title.lower()} working with "
+                f"{', '.join(skills[:-1])} and {skills[-1]} on production systems."
+            ),
+            "skills": skills,
+            "location": rng.choice(CITIES),
+            "jobType": weighted(rng, JOB_TYPES),
+            "duration": rng.choice(DURATIONS),
+            "salary": f"${rng.randrange(4000, 10500, 100):,}/month",
+            "experienceLevel": weighted(rng, EXPERIENCE_LEVELS),
+            "workLocation": weighted(rng, WORK_LOCATIONS),
+            "companySize": weighted(rng, COMPANY_SIZES),
+            "industry": rng.choice(industries),
+            "requirements": [r.format(skill=rng.choice(skills)) for r in rng.sample(REQUIREMENTS, 3)],
+            "benefits": rng.sample(BENEFITS, rng.randint(2, 5)),
+            "applicationDeadline": (start - timedelta(weeks=rng.randint(6, 12))).isoformat(),
+            "startDate": start.isoformat(),
+        })
+    return docs
+
+
+def user_block(seed, block, total):
+    rng = block_rng("users", seed, block)
+    docs = []
+    for i in block_range(block, total):
+        role = rng.choice(ROLES)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        skills = role_skills(rng, role, 3, 8)
+        graduation = rng.randint(2024, 2028)
+        user = {
+            "_id": object_id("users", seed, i),
+            "firstName": first,
+            "lastName": last,
+            "email": f"{first}.{last}.{i}@example.com".lower(),
+            "phone": f"+1-555-{rng.randint(0, 9999):04d}",
+            "location": rng.choice(CITIES),
+            "dateOfBirth": date(graduation - 22, rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+            "gender": rng.choice(["female", "male", "other", "prefer-not-to-say"]),
+            "currentJobTitle": rng.choice(["Student", "Student", "Teaching Assistant", "Research Assistant", None]),
+            "currentCompany": None,
+            "experienceLevel": weighted(rng, EXPERIENCE_LEVELS),
+            "totalExperience": rng.choice(["0-1", "0-1", "1-3", "3-5"]),
+            "expectedSalary": f"${rng.randrange(4000, 9000, 500):,}/month",
+            "jobType": weighted(rng, JOB_TYPES),
+            "workLocation": weighted(rng, WORK_LOCATIONS),
+            "education": [{
+                "degree": rng.choice(["bachelor", "bachelor", "master", "phd"]),
+                "field": rng.choice(DEGREE_FIELDS),
+                "institution": rng.choice(UNIVERSITIES),
+                "graduationYear": str(graduation),
+                "gpa": f"{rng.uniform(2.8, 4.0):.2f}",
+            }],
+            "technicalSkills": skills,
+            "softSkills": rng.sample(SOFT_SKILLS, rng.randint(1, 3)),
+            "languages": ["English"] + rng.sample(LANGUAGES[1:], rng.randint(0, 2)),
+            "workExperience": [
+                {
+                    "company": rng.choice(COMPANIES),
+                    "position": rng.choice(ROLES)[0],
+                    "startDate": f"{graduation - rng.randint(2, 4)}-06-01",
+                    "endDate": f"{graduation - rng.randint(1, 2)}-08-31",
+                    "current": False,
+                    "description": f"Worked with {rng.choice(skills)}",
+                }
+                for _ in range(rng.choice([0, 0, 1, 1, 2]))
+            ],
+            "bio": f"{role[0].replace(' Intern', '')} student interested in {', '.join(skills[:3])}.",
+            "portfolio": None,
+            "linkedin": f"https://linkedin.com/in/{first.lower()}-{last.lower()}-{i}",
+            "github": f"https://github.com/{first.lower()}{i}" if rng.random() < 0.6 else None,
+            "website": None,
+            "jobPreferences": [role[0]] + ([rng.choice(ROLES)[0]] if rng.random() < 0.4 else []),
+            "industryPreferences": rng.sample(role[2], min(len(role[2]), rng.randint(0, 2))),
+            "companySize": weighted(rng, COMPANY_SIZES) if rng.random() < 0.7 else None,
+            "remoteWork": rng.random() < 0.5,
+            "willingToRelocate": rng.random() < 0.3,
+        }
+        user["features"] = compute_user_features(user)
+        docs.append(user)
+    return docs
+
+
+def application_block(seed, block, users, internships, per_user):
+    """Applications of the users in `block`, about `per_user` each on average."""
+    rng = block_rng("applications", seed, block)
+    docs = []
+    if internships == 0 or per_user <= 0:
+        return docs
+    for u in block_range(block, users):
+        count = min(int(rng.expovariate(1 / per_user)), MAX_APPLICATIONS_PER_USER, internships)
+        # Skewed popularity: rank r is much likelier for small r; ranks are
+        # scattered over the catalog by a multiplicative hash
+        ranks = set()
+        while len(ranks) < count:
+            ranks.add(int(internships * rng.random() ** 3))
+        for j, rank in enumerate(sorted(ranks)):
+            docs.append({
+                "_id": object_id("applications", seed, u * MAX_APPLICATIONS_PER_USER + j),
+                "user_id": object_id("users", seed, u),
+                "internship_id": object_id("internships", seed, rank * 2654435761 % internships),
+                "status": weighted(rng, APPLICATION_STATUSES),
+            })
+    return docs
+
+
+def generate(kind, seed, users, internships, per_user=3.0):
+    """Yield all records of `kind` in order, block by block."""
+    total = internships if kind == "internships" else users
+    for block in range((total + BLOCK_SIZE - 1) // BLOCK_SIZE):
+        if kind == "internships":
+            yield from internship_block(seed, block, internships)
+        elif kind == "users":
+            yield from user_block(seed, block, users)
+        else:
+            yield from application_block(seed, block, users, internships, per_user)
+
+
+def read_records(out, kind):
+    """Yield records written by --out, with their ObjectIds restored."""
+    for path in sorted(glob.glob(os.path.join(out, kind, "part-*.ndjson"))):
+        with open(path, "rb") as f:
+            for line in f:
+                doc = orjson.loads(line)
+                for field in ("_id", "user_id", "internship_id"):
+                    if field in doc:
+                        doc[field] = ObjectId(doc[field])
+                yield doc
+
+
+# Worker process state: one MongoClient per worker, created on first use
+_db = None
+
+
+def _worker_db(uri):
+    global _db
+    if _db is None:
+        from pymongo import MongoClient
+        _db = MongoClient(uri).aiintern
+    return _db
+
+
+def write_block(task):
+    """Generate one block and write it; runs in a worker process."""
+    kind, block, args = task
+    if kind == "internships":
+        docs = internship_block(args["seed"], block, args["internships"])
+    elif kind == "users":
+        docs = user_block(args["seed"], block, args["users"])
+    else:
+        docs = application_block(args["seed"], block, args["users"], args["internships"], args["per_user"])
+
+    if args["out"]:
+        directory = os.path.join(args["out"], kind)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"part-{block:05d}.ndjson"), "wb") as f:
+            for doc in docs:
+                f.write(dumps(doc) + b"\n")
+
+    inserted = 0
+    if args["mongo_uri"]:
+        from pymongo.errors import BulkWriteError
+        collection = _worker_db(args["mongo_uri"])[kind]
+        for start in range(0, len(docs), args["batch_size"]):
+            batch = docs[start:start + args["batch_size"]]
+            try:
+                inserted += len(collection.insert_many(batch, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                # Re-running a seed skips the records that already exist
+                inserted += e.details.get("nInserted", 0)
+    return kind, len(docs), inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--internships", type=int, default=20000)
+    parser.add_argument("--applications-per-user", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mongo", action="store_true", help="insert into the configured MongoDB")
+    parser.add_argument("--drop", action="store_true", help="clear the collections first (with --mongo)")
+    parser.add_argument("--out", help="directory for NDJSON part files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.mongo and not args.out:
+        parser.error("pass --mongo and/or --out")
+
+    mongo_uri = None
+    if args.mongo:
+        from config import MONGODB_URI
+        mongo_uri = MONGODB_URI
+        if args.drop:
+            # Own client, closed before the worker processes are forked
+            from pymongo import MongoClient
+            client = MongoClient(mongo_uri)
+            for kind in KIND_CODES:
+                client.aiintern[kind].delete_many({})
+            client.close()
+            print("🗑️  Cleared users, internships and applications")
+
+    options = {
+        "seed": args.seed,
+        "users": args.users,
+        "internships": args.internships,
+        "per_user": args.applications_per_user,
+        "out": args.out,
+        "mongo_uri": mongo_uri,
+        "batch_size": args.batch_size,
+    }
+    tasks = []
+    for kind, total in (("internships", args.internships), ("users", args.users), ("applications", args.users)):
+        tasks += [(kind, block, options) for block in range((total + BLOCK_SIZE - 1) // BLOCK_SIZE)]
+
+    start = time.perf_counter()
+    generated = dict.fromkeys(KIND_CODES, 0)
+    inserted = dict.fromkeys(KIND_CODES, 0)
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(write_block, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            kind, count, written = future.result()
+            generated[kind] += count
+            inserted[kind] += written
+            if done % 20 == 0 or done == len(futures):
+                print(f"   ... {done}/{len(futures)} blocks, {sum(generated.values())} records")
+
+    elapsed = time.perf_counter() - start
+    for kind in KIND_CODES:
+        line = f"✅ {generated[kind]} {kind}"
+        if mongo_uri:
+            line += f" ({inserted[kind]} inserted)"
+        print(line)
+    print(f"⏱️  {sum(generated.values())} records in {elapsed:.1f}s "
+          f"({sum(generated.values()) / max(elapsed, 1e-9):,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
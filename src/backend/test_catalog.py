@@ -0,0 +1,69 @@
+"""
+Unit tests for the catalog snapshot
+
+Runs CatalogSnapshot against the in-memory collections of memory_db.py, so
+no MongoDB server is needed. Run with: python -m pytest test_catalog.py
+"""
+
+import asyncio
+
+import numpy as np
+
+import synthetic_data
+from catalog import CatalogSnapshot
+from catalog_store import CatalogStore
+from memory_db import MemoryDatabase
+
+TEXT_WEIGHT = 0.1
+
+
+async def seeded_collection(count):
+    db = MemoryDatabase()
+    await db.internships.insert_many(list(synthetic_data.generate("internships", 0, 10, count)))
+    return db.internships
+
+
+def new_internship(number):
+    return {"_id": synthetic_data.object_id("internships", 1, number), "title": "New", "skills": ["Python"]}
+
+
+def test_local_write_keeps_engine_mapped_from_store(tmp_path):
+    async def run():
+        collection = await seeded_collection(300)
+        snapshot = CatalogSnapshot(collection, ttl_seconds=0.01, text_weight=TEXT_WEIGHT,
+                                   store=CatalogStore(str(tmp_path)))
+        engine = await (await snapshot.get()).load_engine()
+        assert isinstance(engine.skill_counts, np.memmap)
+
+        doc = new_internship(1)
+        await collection.insert_one(doc)
+        await snapshot.add([doc])
+        view = await snapshot.get()
+        assert len(view.items) == 301 and view.store is not None
+        engine = await view.load_engine()
+        assert isinstance(engine.skill_counts, np.memmap)
+
+        # Still mapped once the TTL expires with the catalog unchanged
+        await asyncio.sleep(0.02)
+        assert await snapshot.get() is view
+        assert isinstance((await view.load_engine()).skill_counts, np.memmap)
+
+    asyncio.run(run())
+
+
+def test_local_write_extends_view_without_store():
+    async def run():
+        collection = await seeded_collection(300)
+        snapshot = CatalogSnapshot(collection, ttl_seconds=0, text_weight=TEXT_WEIGHT)
+        old = await snapshot.get()
+        await old.load_engine()
+
+        doc = new_internship(1)
+        await collection.insert_one(doc)
+        await snapshot.add([doc])
+        view = await snapshot.get()
+        assert view is not old and len(view.items) == 301
+        # Extended from the loaded engine, not rebuilt
+        assert view._engine is not None and view._engine.size == 301
+
+    asyncio.run(run())
@@ -0,0 +1,168 @@
+"""
+Unit tests for the vectorized scoring engine
+
+ScoringEngine must give the same scores as the reference
+calculate_match_score(), and top_n_indices() must order ties by catalog
+position. With TF-IDF text blended in (the default TEXT_WEIGHT) the
+batched, extended and stored engines must agree with score().
+Run with: python -m pytest test_recommender.py
+"""
+
+import numpy as np
+import pytest
+
+import synthetic_data
+from catalog_store import CatalogStore
+from recommender import ScoringEngine, TextIndex, calculate_match_score, internship_text, top_n_indices
+
+# config.TEXT_MATCH_WEIGHT's default, the weighting production scores with
+TEXT_WEIGHT = 0.1
+
+# Profiles with missing or None preference fields, which the scalar path
+# reads with .get() and the engine encodes as vocabulary values
+EDGE_USERS = [
+    {},
+    {
+        "technicalSkills": None,
+        "industryPreferences": None,
+        "experienceLevel": None,
+        "workLocation": None,
+        "companySize": None,
+        "jobType": None,
+        "remoteWork": True,
+    },
+    {
+        "technicalSkills": ["PYTHON", "python", "SQL"],
+        "industryPreferences": ["TECHNOLOGY"],
+        "experienceLevel": "entry",
+        "workLocation": "remote",
+        "willingToRelocate": True,
+    },
+]
+
+EDGE_INTERNSHIPS = [
+    {"_id": 1},
+    {"_id": 2, "skills": [], "industry": "Technology", "workLocation": "onsite"},
+    {"_id": 3, "skills": ["Python", "PYTHON", "Go"], "experienceLevel": "senior", "jobType": "internship"},
+]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    internships = list(synthetic_data.generate("internships", 0, 100, 2000)) + EDGE_INTERNSHIPS
+    users = list(synthetic_data.generate("users", 0, 100, 2000))
+    # Without stored features too, so both user_features() paths are covered
+    users += [{k: v for k, v in user.items() if k != "features"} for user in users[:10]]
+    return internships, users + EDGE_USERS
+
+
+def reference_scores(user, internships):
+    return np.array([calculate_match_score(user, it) for it in internships], dtype=np.float64)
+
+
+def test_score_matches_calculate_match_score(catalog):
+    internships, users = catalog
+    engine = ScoringEngine(internships)
+    for user in users:
+        assert np.array_equal(engine.score(user), reference_scores(user, internships))
+
+
+def test_score_rows_matches_full_score(catalog):
+    internships, users = catalog
+    engine = ScoringEngine(internships)
+    rows = np.arange(0, len(internships), 7)
+    for user in users[:20]:
+        assert np.array_equal(engine.score(user, rows), engine.score(user)[rows])
+
+
+def test_score_many_matches_score(catalog):
+    internships, users = catalog
+    engine = ScoringEngine(internships)
+    scores = engine.score_many(users)
+    assert scores.shape == (len(users), len(internships))
+    for user, row in zip(users, scores):
+        assert np.array_equal(row, reference_scores(user, internships))
+
+
+def test_extended_engine_matches_fresh_engine(catalog):
+    internships, users = catalog
+    old = ScoringEngine(internships[:1000])
+    engine = old.extended(internships[1000:])
+    for user in users[:20]:
+        assert np.array_equal(engine.score(user), reference_scores(user, internships))
+        # The engine it was extended from is unchanged
+        assert np.array_equal(old.score(user), reference_scores(user, internships[:1000]))
+
+
+def test_empty_catalog():
+    engine = ScoringEngine([])
+    assert engine.score(EDGE_USERS[2]).shape == (0,)
+    assert engine.score_many(EDGE_USERS).shape == (len(EDGE_USERS), 0)
+
+
+def test_text_weight_is_blended(catalog):
+    internships, users = catalog
+    engine = ScoringEngine(internships, text_weight=TEXT_WEIGHT)
+    assert engine.text_index is not None
+    assert not np.array_equal(engine.score(users[0]), reference_scores(users[0], internships))
+
+
+def test_text_score_many_matches_score(catalog):
+    internships, users = catalog
+    engine = ScoringEngine(internships, text_weight=TEXT_WEIGHT)
+    scores = engine.score_many(users)
+    for user, row in zip(users, scores):
+        single = engine.score(user)
+        np.testing.assert_allclose(row, single, rtol=0, atol=1e-12)
+        assert np.array_equal(top_n_indices(row, 10), top_n_indices(single, 10))
+
+
+def test_text_extended_engine_matches_fresh_engine(catalog):
+    internships, users = catalog
+    old = ScoringEngine(internships[:1000], text_weight=TEXT_WEIGHT)
+    engine = old.extended(internships[1000:])
+    # A fresh engine over the whole catalog with the TF-IDF model the
+    # extended one reuses (refitting would change the vocabulary weights)
+    fresh = ScoringEngine(internships, text_weight=TEXT_WEIGHT)
+    vectorizer = old.text_index.vectorizer
+    matrix = vectorizer.transform([internship_text(it) for it in internships])
+    fresh.text_index = TextIndex.from_parts(vectorizer, matrix, len(internships))
+    for user in users[:20]:
+        np.testing.assert_allclose(engine.score(user), fresh.score(user), rtol=0, atol=1e-12)
+        assert np.array_equal(top_n_indices(engine.score(user), 10), top_n_indices(fresh.score(user), 10))
+
+
+def test_text_engine_store_round_trip(catalog, tmp_path):
+    internships, users = catalog
+    engine = ScoringEngine(internships, text_weight=TEXT_WEIGHT)
+    stored = CatalogStore(str(tmp_path)).engine(internships, "test", TEXT_WEIGHT)
+    assert stored.text_weight == TEXT_WEIGHT
+    for user in users[:20]:
+        assert np.array_equal(stored.score(user), engine.score(user))
+    assert np.array_equal(stored.score_many(users[:20]), engine.score_many(users[:20]))
+
+
+@pytest.mark.parametrize("scores, n, expected", [
+    ([0.5, 0.9, 0.1], 2, [1, 0]),
+    # Ties keep catalog order, also when the cut falls inside a tie
+    ([0.5, 0.5, 0.5, 0.5], 2, [0, 1]),
+    ([0.2, 0.7, 0.7, 0.1, 0.7], 2, [1, 2]),
+    ([0.2, 0.7, 0.7, 0.1, 0.7], 4, [1, 2, 4, 0]),
+    ([0.3, 0.9, 0.3, 0.9], 3, [1, 3, 0]),
+    # n larger than the catalog, zero and negative
+    ([0.1, 0.3, 0.3], 10, [1, 2, 0]),
+    ([0.1, 0.3], 0, []),
+    ([0.1, 0.3], -1, []),
+    ([], 5, []),
+])
+def test_top_n_indices(scores, n, expected):
+    assert top_n_indices(np.array(scores, dtype=np.float64), n).tolist() == expected
+
+
+def test_top_n_indices_matches_stable_sort():
+    rng = np.random.default_rng(0)
+    # Few distinct values, so most cuts fall inside a tie
+    scores = rng.integers(0, 5, 1000).astype(np.float64) / 4
+    for n in (1, 10, 100, 999, 1000):
+        expected = np.argsort(-scores, kind="stable")[:n]
+        assert np.array_equal(top_n_indices(scores, n), expected)
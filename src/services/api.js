@@ -65,8 +65,11 @@ class ApiService {
   }
 
   // Internships
-  async getInternships() {
-    return this.request('/internships');
+  // Returns one page: { items, next_after }. Pass next_after back as `after`
+  // for the next page; filters and `fields` are optional query parameters.
+  async getInternships(params = {}) {
+    const query = new URLSearchParams(params).toString();
+    return this.request(query ? `/internships?${query}` : '/internships');
   }
 
   async getInternship(internshipId) {
@@ -96,6 +99,22 @@ class ApiService {
     });
   }
 
+  // Returns { application_ids, missing } (unknown internship ids are skipped)
+  async applyForInternships(userId, internshipIds) {
+    return this.request('/apply/bulk', {
+      method: 'POST',
+      body: JSON.stringify({
+        user_id: userId,
+        internship_ids: internshipIds,
+      }),
+    });
+  }
+
+  // Returns { applications }, each with an `internship` summary
+  async getUserApplications(userId) {
+    return this.request(`/users/${userId}/applications`);
+  }
+
   // Seed Data
   async seedInternships(internships) {
     return this.request('/seed_internships', {